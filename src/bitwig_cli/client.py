@@ -12,11 +12,11 @@ from .protocol import (
     RPCNotification,
     RPCRequest,
     RPCResponse,
-    batch_to_frame,
+    batch_to_frame_parts,
     decode_frame_header,
     parse_message,
     parse_response,
-    request_to_frame,
+    request_to_frame_parts,
 )
 
 logger = logging.getLogger(__name__)
@@ -25,6 +25,9 @@ DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 8418  # CLI port on MCP server (Bitwig connects to 8417)
 DEFAULT_TIMEOUT = 5.0
 
+# Max buffers per sendmsg call (IOV_MAX on Linux and macOS)
+_IOV_MAX = 1024
+
 
 class BitwigClient:
     """Client for communicating with the Bitwig controller extension.
@@ -72,12 +75,25 @@ class BitwigClient:
     def __exit__(self, *args: object) -> None:
         self.disconnect()
 
-    def _send(self, data: bytes) -> None:
-        """Send data to the server."""
+    def _send_parts(self, parts: list[bytes]) -> None:
+        """Send buffers back to back without joining them (vectored I/O)."""
         if self._sock is None:
             raise RuntimeError("Not connected")
-        logger.debug("Sending %d bytes: %s", len(data), data[:20].hex())
-        self._sock.sendall(data)
+        logger.debug("Sending %d bytes in %d parts", sum(map(len, parts)), len(parts))
+
+        if not hasattr(self._sock, "sendmsg"):  # Not available on Windows
+            self._sock.sendall(b"".join(parts))
+            return
+
+        # sendmsg may write only part of the data; drop what was sent and retry
+        views = [memoryview(p) for p in parts]
+        while views:
+            sent = self._sock.sendmsg(views[:_IOV_MAX])
+            while views and sent >= len(views[0]):
+                sent -= len(views[0])
+                views.pop(0)
+            if sent:
+                views[0] = views[0][sent:]
 
     def _recv_exactly(self, n: int) -> bytes:
         """Receive exactly n bytes from the server."""
@@ -117,7 +133,7 @@ class BitwigClient:
         request = RPCRequest(method=method, params=params or {}, id=self._next_id())
         logger.debug("Calling %s(%s)", method, params)
 
-        self._send(request_to_frame(request))
+        self._send_parts(request_to_frame_parts(request))
         response_data = self._recv_frame()
         response = parse_response(response_data)
 
@@ -158,7 +174,7 @@ class BitwigClient:
             self._sock.settimeout(timeout)
 
         try:
-            self._send(request_to_frame(request))
+            self._send_parts(request_to_frame_parts(request))
 
             # Read messages until we get a response (not notification)
             while True:
@@ -202,7 +218,7 @@ class BitwigClient:
         ]
         logger.debug("Batch calling %d methods", len(requests))
 
-        self._send(batch_to_frame(requests))
+        self._send_parts(batch_to_frame_parts(requests))
         response_data = self._recv_frame()
         responses = parse_response(response_data)
 
@@ -44,3 +44,11 @@ def get_config_dir() -> Path:
     if xdg_config:
         return Path(xdg_config) / "bitwig-cli"
     return Path.home() / ".config" / "bitwig-cli"
+
+
+def get_cache_dir() -> Path:
+    """Get the cache directory for bitwig-cli (safe to delete at any time)."""
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache:
+        return Path(xdg_cache) / "bitwig-cli"
+    return Path.home() / ".cache" / "bitwig-cli"
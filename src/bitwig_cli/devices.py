@@ -2,19 +2,20 @@
 
 from __future__ import annotations
 
-import os
+import heapq
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterator
 
-from .search import fuzzy_match
+from .search import QueryCtx, could_match, fuzzy_match_lower, iter_files_concurrently
 
 
-# Device category classifications for base Bitwig devices
+# Device category classifications for base Bitwig devices (also used to type
+# presets by the device folder they live in)
 INSTRUMENTS = {
     "Polymer", "Phase-4", "FM-4", "Polysynth", "Sampler", "Drum Machine",
     "E-Clap", "E-Cowbell", "E-Hat", "E-Kick", "E-Snare", "E-Tom",
-    "Organ", "Wavetable", "Poly Grid", "Note Grid",
+    "Organ", "FM-4 Operator", "Wavetable", "Poly Grid", "Note Grid",
     "Instrument Layer", "Instrument Selector",
     # Drum/percussion elements
     "v0 Clap", "v0 Cowbell", "v0 Cymbal", "v0 Hat Closed", "v0 Hat Open",
@@ -27,7 +28,7 @@ INSTRUMENTS = {
 
 NOTE_FX = {
     "Arpeggiator", "Diatonic Transposer", "Harmonize", "Humanize",
-    "Multi-note", "Note Delay", "Note Echo", "Note Filter",
+    "Multi-note", "Multi-Note", "Note Delay", "Note Echo", "Note Filter",
     "Note FX Layer", "Note FX Selector", "Note Harmonizer",
     "Note Latch", "Note Length", "Note MOD", "Note Pitch Shifter",
     "Note Receiver", "Note Repeats", "Note Transpose", "Note Velocity",
@@ -78,20 +79,24 @@ UTILITY = {
 }
 
 
+# Known device -> category, so classification is one lookup instead of a check
+# per set. Later entries win, keeping the inst > note > fx > routing > mod >
+# util precedence (e.g. "Note Receiver" is both note FX and routing).
+_DEVICE_CATEGORIES: dict[str, str] = {
+    **dict.fromkeys(UTILITY, "util"),
+    **dict.fromkeys(MODULATORS, "mod"),
+    **dict.fromkeys(ROUTING, "routing"),
+    **dict.fromkeys(AUDIO_FX, "fx"),
+    **dict.fromkeys(NOTE_FX, "note"),
+    **dict.fromkeys(INSTRUMENTS, "inst"),
+}
+
+
 def _get_device_category(name: str) -> str:
     """Determine device category from name."""
-    if name in INSTRUMENTS:
-        return "inst"
-    if name in NOTE_FX:
-        return "note"
-    if name in AUDIO_FX:
-        return "fx"
-    if name in ROUTING:
-        return "routing"
-    if name in MODULATORS:
-        return "mod"
-    if name in UTILITY:
-        return "util"
+    category = _DEVICE_CATEGORIES.get(name)
+    if category:
+        return category
     # Heuristics
     if "Grid" in name:
         if "FX" in name:
@@ -143,12 +148,28 @@ def find_devices_filesystem() -> Iterator[str]:
         Path.home() / "Documents/Bitwig Studio/Library/devices",
     ]
 
-    for base in search_paths:
-        if base.exists():
-            for root, _, files in os.walk(base):
-                for f in files:
-                    if f.endswith(".bwdevice"):
-                        yield os.path.join(root, f)
+    yield from iter_files_concurrently(search_paths, ".bwdevice")
+
+
+# Deduplicated (path, name, category) per device file, scanned once per process
+_DEVICE_CACHE: list[tuple[str, str, str]] | None = None
+
+
+def get_all_devices() -> list[tuple[str, str, str]]:
+    """Scan device files once and return (path, name, category) entries.
+
+    Base devices ship with the application, so the scan is reused by every
+    search in the process (e.g. resolving all devices of a song).
+    """
+    global _DEVICE_CACHE
+
+    if _DEVICE_CACHE is None:
+        _DEVICE_CACHE = []
+        for path in dict.fromkeys(find_devices()):
+            # Extract device name from filename
+            name = Path(path).stem
+            _DEVICE_CACHE.append((path, name, _get_device_category(name)))
+    return _DEVICE_CACHE
 
 
 def search_devices(
@@ -169,24 +190,21 @@ def search_devices(
         List of DeviceMatch sorted by relevance
     """
     results: list[DeviceMatch] = []
-    seen_paths: set[str] = set()
-
-    for path in find_devices():
-        # Skip duplicates
-        if path in seen_paths:
-            continue
-        seen_paths.add(path)
-
-        # Extract device name from filename
-        name = Path(path).stem
-        category = _get_device_category(name)
+    ctx = QueryCtx.from_query(query)
+    prefilter = min_score > 0
 
+    for path, name, category in get_all_devices():
         # Apply category filter if specified
         if category_filter and category != category_filter:
             continue
 
+        # Skip devices that cannot score above zero without running the scorer
+        name_lower = name.lower()
+        if prefilter and not could_match(ctx, name_lower):
+            continue
+
         # Score based on name match
-        score = fuzzy_match(query, name)
+        score = fuzzy_match_lower(ctx, name_lower)
 
         if score >= min_score:
             results.append(
@@ -198,7 +216,5 @@ def search_devices(
                 )
             )
 
-    # Sort by score (descending), then by name
-    results.sort(key=lambda m: (-m.score, m.name.lower()))
-
-    return results[:limit]
+    # Top `limit` by score (descending), then by name and path
+    return heapq.nsmallest(limit, results, key=lambda m: (-m.score, m.name.lower(), m.file_path))
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import heapq
 import sqlite3
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterator
 
-from .search import fuzzy_match
+from .search import QueryCtx, could_match, fuzzy_match_lower, iter_mdfind
 
 
 @dataclass
@@ -108,16 +109,9 @@ def _query_kontakt_db(db_path: Path) -> list[KontaktMatch]:
 def find_nki_spotlight() -> Iterator[str]:
     """Find NKI files using Spotlight (fallback)."""
     try:
-        result = subprocess.run(
-            ["mdfind", "-name", ".nki"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                if line.endswith(".nki"):
-                    yield line
+        for line in iter_mdfind(["-name", ".nki"], timeout=5):
+            if line.endswith(".nki"):
+                yield line
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
 
@@ -207,20 +201,27 @@ def search_kontakt(
     results: list[KontaktMatch] = []
 
     library_filter_lower = library_filter.lower() if library_filter else None
+    ctx = QueryCtx.from_query(query)
+    prefilter = min_score > 0
 
     for inst in instruments:
+        library_lower = inst.library.lower()
+
         # Filter by library if specified
-        if library_filter_lower and library_filter_lower not in inst.library.lower():
+        if library_filter_lower and library_filter_lower not in library_lower:
+            continue
+
+        # Skip instruments that cannot score above zero without running the scorer
+        name_lower = inst.name.lower()
+        if prefilter and not could_match(ctx, name_lower, library_lower):
             continue
 
         # Score based on name and library
-        score = fuzzy_match(query, inst.name, inst.library)
+        score = fuzzy_match_lower(ctx, name_lower, library_lower)
 
         if score >= min_score:
             inst.score = score
             results.append(inst)
 
-    # Sort by score (descending), then by name
-    results.sort(key=lambda m: (-m.score, m.name.lower()))
-
-    return results[:limit]
+    # Top `limit` by score (descending), then by name and path
+    return heapq.nsmallest(limit, results, key=lambda m: (-m.score, m.name.lower(), m.file_path))
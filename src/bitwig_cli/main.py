@@ -5,6 +5,7 @@ For direct control commands (device params, RPC calls), use `groove-link` instea
 
 from __future__ import annotations
 
+import time
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -16,6 +17,7 @@ from rich.console import Console
 from rich.table import Table
 
 from . import __version__
+from .abc import abc_to_midi
 from .common import (
     HostOption,
     PortOption,
@@ -32,7 +34,8 @@ from .mtron import search_mtron
 from .plugins import search_plugins
 from .splice import search_splice
 from .presets import search_presets
-from .resolve import resolve_device
+from .resolve import preload_sources, resolve_device
+from .song import DeviceEntry, TrackConfig, load_song_config
 from .table import Column, adaptive_table
 
 # CLI app
@@ -133,8 +136,6 @@ def preset(
         bitwig preset delay --type fx
         bitwig preset arp -t note
     """
-    import time
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -193,8 +194,6 @@ def plugin(
         bitwig plugin surge --format clap
         bitwig plugin compressor -n 10
     """
-    import time
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -241,8 +240,6 @@ def kontakt(
         bitwig kontakt bass --library "Session Guitarist"
         bitwig kontakt strings -n 10
     """
-    import time
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -292,8 +289,6 @@ def mtron(
         bitwig mtron choir -c "Streetly Tapes"
         bitwig mtron strings -n 10
     """
-    import time
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -350,9 +345,6 @@ def splice(
         bitwig splice cello -p "LABS"
         bitwig splice strings -n 10
     """
-    import time
-    from pathlib import Path
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -404,8 +396,6 @@ def device(
         bitwig device polymer --category inst
         bitwig device note -c note
     """
-    import time
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -495,8 +485,6 @@ def track_create(
 
     Use --track to create a specific track, or omit to create all.
     """
-    import time
-
     setup_logging(verbose)
     start = time.perf_counter()
 
@@ -505,42 +493,31 @@ def track_create(
         rprint(f"[red]Error:[/red] Config file not found: {config_file}")
         raise typer.Exit(1)
 
+    # Parse, validate and convert the whole config up front
     try:
-        with open(config_file) as f:
-            config = yaml.safe_load(f)
+        song = load_song_config(config_file)
     except yaml.YAMLError as e:
         rprint(f"[red]Error:[/red] Invalid YAML: {e}")
         raise typer.Exit(1)
-
-    if not isinstance(config, dict):
-        rprint("[red]Error:[/red] Config must be a YAML mapping")
+    except ValueError as e:
+        rprint(f"[red]Error:[/red] {e}")
         raise typer.Exit(1)
 
-    # Parse declarative format: song metadata at top level or in 'song' section
-    song_meta = config.get("song", {})
-    song_title = song_meta.get("title") or config.get("name", "Untitled")
-
-    # Get tracks section
-    tracks_config = config.get("tracks", {})
+    tracks_config = song.tracks
     if not tracks_config:
         rprint("[red]Error:[/red] No tracks defined in config")
         raise typer.Exit(1)
 
-    # Get groups (for future use - API may not support programmatic grouping)
-    groups_config = config.get("groups", {})
-    if groups_config:
-        rprint(f"[dim]Groups defined: {', '.join(groups_config.keys())}[/dim]")
+    # Groups are for future use - API may not support programmatic grouping
+    if song.groups:
+        rprint(f"[dim]Groups defined: {', '.join(song.groups.keys())}[/dim]")
 
-    rprint(f"[cyan]Song:[/cyan] {song_title}")
+    rprint(f"[cyan]Song:[/cyan] {song.title}")
 
-    # Set tempo from song.tempo or legacy bpm field
-    tempo = song_meta.get("tempo") or config.get("bpm") or config.get("tempo")
-    if tempo:
-        _set_tempo(tempo, host, port)
+    if song.tempo:
+        _set_tempo(song.tempo, host, port)
 
-    # Set time signature (default to 4/4 if not specified)
-    time_sig = song_meta.get("time") or config.get("time") or "4/4"
-    _set_time_signature(time_sig, host, port)
+    _set_time_signature(song.time_signature, host, port)
 
     # Filter to specific track if requested
     if track_name:
@@ -553,23 +530,31 @@ def track_create(
     # Get config directory for resolving relative MIDI paths
     config_dir = config_file.parent
 
-    # Get all track names for cross-referencing (e.g., receives)
-    all_track_names = list(tracks_config.keys())
+    # Load every library the devices will be resolved against up front, so
+    # independent sources (preset index, device scan, ...) load concurrently
+    preload_sources(
+        {
+            parsed[1]
+            for track_cfg in tracks_config.values()
+            for spec in _track_device_specs(track_cfg)
+            if (parsed := _device_query(spec)) is not None
+        }
+    )
 
     # Create each track
     created_count = 0
     midi_inserted = 0
-    for track_index, (tname, track_cfg) in enumerate(tracks_config.items()):
-        if not _create_track(tname, track_cfg, host, port, all_track_names):
+    for tname, track_cfg in tracks_config.items():
+        if not _create_track(track_cfg, host, port):
             rprint(f"[red]Failed to create track:[/red] {tname}")
             continue
 
         created_count += 1
 
         # Get part file (declarative) or legacy abc/midi fields
-        part_file = track_cfg.get("part")
-        abc_file = track_cfg.get("abc") if not part_file else None
-        midi_file = track_cfg.get("midi") if not part_file else None
+        part_file = track_cfg.part
+        abc_file = track_cfg.abc if not part_file else None
+        midi_file = track_cfg.midi if not part_file else None
 
         # Determine if part is ABC or MIDI based on extension
         if part_file:
@@ -582,8 +567,6 @@ def track_create(
                 abc_file = part_file
 
         if abc_file:
-            from .abc import abc_to_midi
-
             abc_path = Path(abc_file)
             if not abc_path.is_absolute():
                 abc_path = config_dir / abc_path
@@ -640,12 +623,43 @@ def track_create(
     rprint(f"[green]✓[/green] {summary} in {elapsed:.2f}s")
 
 
+def _track_device_specs(track_cfg: TrackConfig) -> list[DeviceEntry | None]:
+    """Device entries of a track, in insertion order."""
+    # Build device list from declarative format
+    device_specs: list[DeviceEntry | None] = []
+
+    # Handle receives: add Audio Receiver for each source
+    # (will need source param set later)
+    for _ in track_cfg.receives:
+        device_specs.append({"query": "Audio Receiver", "hint": "device"})
+
+    # Handle declarative instrument/note_fx/fx format
+    if track_cfg.is_declarative:
+        device_specs.extend(track_cfg.note_fx)
+        if track_cfg.has_instrument:
+            device_specs.append(track_cfg.instrument)
+        device_specs.extend(track_cfg.fx)
+    elif not (track_cfg.receives or track_cfg.invalid_receives):
+        # Legacy format: flat devices list
+        device_specs = list(track_cfg.devices)
+
+    return device_specs
+
+
+def _device_query(spec: DeviceEntry | None) -> tuple[str, str | None] | None:
+    """(query, hint) of a device entry, or None if the entry is invalid."""
+    if isinstance(spec, str):
+        # Simple string query
+        return spec, None
+    if isinstance(spec, dict):
+        return spec.get("query", spec.get("name", "")), spec.get("hint")
+    return None
+
+
 def _create_track(
-    name: str,
-    track_cfg: dict,
+    track_cfg: TrackConfig,
     host: str,
     port: int,
-    all_track_names: list[str] | None = None,
 ) -> bool:
     """Create a single track with devices.
 
@@ -669,51 +683,24 @@ def _create_track(
 
     Returns True on success, False on failure.
     """
+    name = track_cfg.name
+
     # Special case: master track adds devices to master bus
-    is_master = name.lower() == "master"
+    is_master = track_cfg.is_master
 
     # Determine track type from config
-    track_type = track_cfg.get("type", "instrument")
+    track_type = track_cfg.type
     if is_master:
         track_type = "master"  # Signal to extension: add to master bus
-    elif "instrument" in track_cfg:
+    elif track_cfg.has_instrument:
         track_type = "instrument"
-    elif "receives" in track_cfg:
+    elif track_cfg.has_receives:
         track_type = "audio"  # Receiving tracks are audio tracks
 
-    # Build device list from declarative format
-    device_specs = []
-    audio_receiver_sources = []  # Track names to receive from
+    for recv_spec in track_cfg.invalid_receives:
+        rprint(f"[yellow]Warning:[/yellow] Invalid receives spec: {recv_spec}")
 
-    # Handle receives: add Audio Receiver for each source
-    receives = track_cfg.get("receives", [])
-    if receives:
-        for recv_spec in receives:
-            # recv_spec is either "track_name" or {"track_name": "pre/post"}
-            if isinstance(recv_spec, str):
-                source_track = recv_spec
-                tap = "pre"
-            elif isinstance(recv_spec, dict):
-                # {"piano": "pre"} format
-                source_track = list(recv_spec.keys())[0]
-                tap = recv_spec[source_track]
-            else:
-                rprint(f"[yellow]Warning:[/yellow] Invalid receives spec: {recv_spec}")
-                continue
-
-            audio_receiver_sources.append((source_track, tap))
-            # Add Audio Receiver device (will need source param set later)
-            device_specs.append({"query": "Audio Receiver", "hint": "device"})
-
-    # Handle declarative instrument/note_fx/fx format
-    if "instrument" in track_cfg or "note_fx" in track_cfg or "fx" in track_cfg:
-        device_specs.extend(track_cfg.get("note_fx", []))
-        if "instrument" in track_cfg:
-            device_specs.append(track_cfg["instrument"])
-        device_specs.extend(track_cfg.get("fx", []))
-    elif not receives:
-        # Legacy format: flat devices list
-        device_specs = track_cfg.get("devices", [])
+    device_specs = _track_device_specs(track_cfg)
 
     # Resolve device names to actual paths
     if is_master:
@@ -722,16 +709,11 @@ def _create_track(
         rprint(f"[cyan]Creating track:[/cyan] {name} ({track_type})")
     resolved_devices = []
     for spec in device_specs:
-        if isinstance(spec, str):
-            # Simple string query
-            query = spec
-            hint = None
-        elif isinstance(spec, dict):
-            query = spec.get("query", spec.get("name", ""))
-            hint = spec.get("hint")
-        else:
+        parsed = _device_query(spec)
+        if parsed is None:
             rprint(f"[yellow]Warning:[/yellow] Skipping invalid device spec: {spec}")
             continue
+        query, hint = parsed
 
         rprint(f"  [dim]Resolving:[/dim] {query}...", end="")
         result = resolve_device(query, hint)
@@ -782,9 +764,9 @@ def _create_track(
             rprint(f"  [green]✓[/green] Created with {devices_loaded} devices")
 
     # Note about Audio Receiver sources (parameter setting is TODO)
-    if audio_receiver_sources:
-        for source_track, tap in audio_receiver_sources:
-            rprint(f"  [dim]Audio Receiver:[/dim] source={source_track} ({tap})")
+    if track_cfg.receives:
+        for recv in track_cfg.receives:
+            rprint(f"  [dim]Audio Receiver:[/dim] source={recv.source} ({recv.tap})")
         rprint(f"  [yellow]Note:[/yellow] Audio Receiver sources need manual configuration")
 
     return True
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import heapq
+import mmap
 import re
 import zlib
-from dataclasses import dataclass, field
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
-from .search import fuzzy_match
+from .search import QueryCtx, could_match, fuzzy_match_lower
 
 
-@dataclass
+@dataclass(slots=True)
 class MTronMatch:
     """An M-Tron patch search result."""
 
@@ -24,6 +27,18 @@ class MTronMatch:
     score: float = field(default=0.0)
     load_type: str = "mtron"  # Loaded via M-Tron Pro IV plugin
 
+    # Precomputed search keys
+    name_lower: str = field(init=False, repr=False, compare=False)
+    collection_lower: str = field(init=False, repr=False, compare=False)
+    category_lower: str = field(init=False, repr=False, compare=False)
+    timbres_lower: list[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.name_lower = self.name.lower()
+        self.collection_lower = self.collection.lower()
+        self.category_lower = self.category.lower()
+        self.timbres_lower = [t.lower() for t in self.timbres]
+
     def to_dict(self) -> dict:
         return {
             "name": self.name,
@@ -41,19 +56,46 @@ class MTronMatch:
 MTRON_LIB_PATH = Path.home() / "Library/Application Support/GForce/M-Tron Pro IV/UPB_md_lib.gforce"
 
 
-def _extract_field(data: str, field: str, start: int) -> tuple[str, int]:
-    """Extract a field value from the binary format.
+# Typical inflated/compressed size ratio, used to presize the output buffer
+_INFLATE_RATIO_HINT = 4
 
-    Format: field_name\x00\x01{len}\x05{value}\x00
+# Marker at the start of each patch record
+_PATCH_MARKER = b"Patch\x00"
 
-    Returns:
-        (value, end_position)
+# One field record: field_name\x00\x01{len}\x05{value}\x00
+# DOTALL: the length byte may be any value, including \n
+# The value never contains \x00, so its scan is possessive (no backtracking state)
+_FIELD_RE = re.compile(
+    rb"(name|author|collection|category|path|timbres\d|types\d)\x00\x01.\x05([^\x00]*+)\x00",
+    re.DOTALL,
+)
+
+
+def _iter_patch_fields(data: bytes, patch_starts: list[int]) -> Iterator[dict[bytes, bytes]]:
+    """Yield the raw fields of each patch region, in a single scan of the data.
+
+    A field belongs to the patch whose region it starts in. If a field
+    repeats within a region, its first value wins.
     """
-    pattern = field + r"\x00\x01.\x05([^\x00]*)\x00"
-    match = re.search(pattern, data[start:])
-    if match:
-        return match.group(1), start + match.end()
-    return "", start
+    if not patch_starts:
+        return
+
+    ends = patch_starts[1:] + [len(data)]
+    i = 0
+    fields: dict[bytes, bytes] = {}
+
+    for m in _FIELD_RE.finditer(data, patch_starts[0]):
+        while m.start() >= ends[i]:
+            yield fields
+            fields = {}
+            i += 1
+        fields.setdefault(m.group(1), m.group(2))
+
+    yield fields
+
+
+def _decode(value: bytes | None) -> str:
+    return value.decode("utf-8", errors="replace") if value else ""
 
 
 def _parse_mtron_library() -> list[MTronMatch]:
@@ -69,10 +111,14 @@ def _parse_mtron_library() -> list[MTronMatch]:
         return []
 
     try:
-        with open(MTRON_LIB_PATH, "rb") as f:
-            compressed = f.read()
-
-        data = zlib.decompress(compressed).decode("utf-8", errors="replace")
+        # Inflate straight from the mapped file (no copy of the compressed
+        # blob), starting from a size hint so the output grows in fewer steps.
+        # Keep the result as bytes; only the extracted field values are decoded
+        with (
+            open(MTRON_LIB_PATH, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            data = zlib.decompress(mapped, bufsize=len(mapped) * _INFLATE_RATIO_HINT)
     except Exception:
         return []
 
@@ -80,57 +126,69 @@ def _parse_mtron_library() -> list[MTronMatch]:
 
     # Find each "Patch" marker and parse the following fields
     # Skip the header (MD_LIB marker)
-    patch_starts = [m.start() for m in re.finditer(r"Patch\x00", data)]
-
-    for i, start in enumerate(patch_starts):
-        # Determine end of this patch entry
-        end = patch_starts[i + 1] if i + 1 < len(patch_starts) else len(data)
-        region = data[start:end]
-
-        # Extract fields using the binary format pattern
-        name, _ = _extract_field(region, "name", 0)
-        author, _ = _extract_field(region, "author", 0)
-        collection, _ = _extract_field(region, "collection", 0)
-        category, _ = _extract_field(region, "category", 0)
-        path, _ = _extract_field(region, "path", 0)
-
-        # Extract timbres (timbres0, timbres1, etc.)
-        timbres = []
-        for j in range(10):
-            val, _ = _extract_field(region, f"timbres{j}", 0)
-            if val:
-                timbres.append(val)
-
-        # Extract types (types0, types1, etc.)
-        types = []
-        for j in range(10):
-            val, _ = _extract_field(region, f"types{j}", 0)
-            if val:
-                types.append(val)
-
-        if name:  # Only add if we got a name
-            patches.append(
-                MTronMatch(
-                    name=name.strip(),
-                    file_path=path.strip() if path else "",
-                    collection=collection.strip().replace("_", " ") if collection else "Unknown",
-                    category=category.strip() if category else "Unknown",
-                    author=author.strip() if author else None,
-                    timbres=timbres,
-                    types=types,
-                )
+    # (plain substring search, so bytes.find beats the regex engine here)
+    patch_starts: list[int] = []
+    i = data.find(_PATCH_MARKER)
+    while i != -1:
+        patch_starts.append(i)
+        i = data.find(_PATCH_MARKER, i + 1)
+
+    for fields in _iter_patch_fields(data, patch_starts):
+        name = _decode(fields.get(b"name"))
+        if not name:  # Only add if we got a name
+            continue
+
+        author = _decode(fields.get(b"author"))
+        collection = _decode(fields.get(b"collection"))
+        category = _decode(fields.get(b"category"))
+        path = _decode(fields.get(b"path"))
+
+        # timbres0..9 and types0..9, in index order
+        timbres = [v for j in range(10) if (v := _decode(fields.get(b"timbres%d" % j)))]
+        types = [v for j in range(10) if (v := _decode(fields.get(b"types%d" % j)))]
+
+        patches.append(
+            MTronMatch(
+                name=name.strip(),
+                file_path=path.strip() if path else "",
+                collection=collection.strip().replace("_", " ") if collection else "Unknown",
+                category=category.strip() if category else "Unknown",
+                author=author.strip() if author else None,
+                timbres=timbres,
+                types=types,
             )
+        )
 
     return patches
 
 
+# Parsed library, keyed on the file's (st_mtime_ns, st_size)
+_MTRON_CACHE: tuple[tuple[int, int], list[MTronMatch]] | None = None
+
+
 def get_all_mtron_patches() -> list[MTronMatch]:
     """Get all M-Tron patches.
 
+    The parsed library is cached in-process and reparsed only when the
+    library file changes. The returned list is shared; don't mutate it.
+
     Returns:
         List of MTronMatch objects (unsorted, unscored)
     """
-    return _parse_mtron_library()
+    global _MTRON_CACHE
+
+    try:
+        st = MTRON_LIB_PATH.stat()
+    except OSError:
+        return []
+
+    key = (st.st_mtime_ns, st.st_size)
+    if _MTRON_CACHE is not None and _MTRON_CACHE[0] == key:
+        return _MTRON_CACHE[1]
+
+    patches = _parse_mtron_library()
+    _MTRON_CACHE = (key, patches)
+    return patches
 
 
 def search_mtron(
@@ -153,38 +211,52 @@ def search_mtron(
         List of MTronMatch sorted by relevance
     """
     patches = get_all_mtron_patches()
-    results: list[MTronMatch] = []
+    ranked: list[tuple[float, str, str, int, MTronMatch]] = []
 
+    ctx = QueryCtx.from_query(query)
+    query_lower = ctx.lower
+    prefilter = min_score > 0
     collection_filter_lower = collection_filter.lower() if collection_filter else None
     category_filter_lower = category_filter.lower() if category_filter else None
 
-    for patch in patches:
+    for i, patch in enumerate(patches):
         # Filter by collection if specified
-        if collection_filter_lower and collection_filter_lower not in patch.collection.lower():
+        if collection_filter_lower and collection_filter_lower not in patch.collection_lower:
             continue
 
         # Filter by category if specified
-        if category_filter_lower and category_filter_lower not in patch.category.lower():
+        if category_filter_lower and category_filter_lower not in patch.category_lower:
+            continue
+
+        category_match = query_lower in patch.category_lower
+        timbre_match = any(query_lower in timbre for timbre in patch.timbres_lower)
+
+        # Skip patches that cannot score above zero without running the scorer
+        if (
+            prefilter
+            and not category_match
+            and not timbre_match
+            and not could_match(ctx, patch.name_lower, patch.collection_lower)
+        ):
             continue
 
         # Score based on name and collection
-        score = fuzzy_match(query, patch.name, patch.collection)
+        score = fuzzy_match_lower(ctx, patch.name_lower, patch.collection_lower)
 
         # Boost if query matches category
-        if query.lower() in patch.category.lower():
+        if category_match:
             score += 0.2
 
         # Boost if query matches any timbre
-        for timbre in patch.timbres:
-            if query.lower() in timbre.lower():
-                score += 0.1
-                break
+        if timbre_match:
+            score += 0.1
 
         if score >= min_score:
-            patch.score = score
-            results.append(patch)
-
-    # Sort by score (descending), then by name
-    results.sort(key=lambda m: (-m.score, m.name.lower()))
-
-    return results[:limit]
+            ranked.append((-score, patch.name_lower, patch.file_path, i, patch))
+
+    # Top `limit` by score (descending), then by name and path. A bounded heap
+    # avoids sorting every match when only a handful are returned. The cached
+    # patches are shared across searches, so results are scored copies.
+    return [
+        replace(patch, score=-neg_score) for neg_score, *_, patch in heapq.nsmallest(limit, ranked)
+    ]
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import heapq
+import json
+import os
 import plistlib
+import re
 import subprocess
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import repeat
 from pathlib import Path
 from typing import Iterator
 
-from .search import fuzzy_match
+from .config import get_cache_dir
+from .search import QueryCtx, could_match, fuzzy_match_lower, iter_mdfind
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginMatch:
     """A plugin search result."""
 
@@ -24,6 +31,16 @@ class PluginMatch:
     bundle_id: str | None = None
     score: float = field(default=0.0)
 
+    # Precomputed search keys
+    name_lower: str = field(init=False, repr=False, compare=False)
+    vendor_lower: str = field(init=False, repr=False, compare=False)
+    expanded_name: str = field(init=False, repr=False, compare=False)  # From abbreviation
+
+    def __post_init__(self) -> None:
+        self.name_lower = self.name.lower()
+        self.vendor_lower = self.vendor.lower()
+        self.expanded_name = PLUGIN_ABBREVIATIONS.get(self.name.upper(), "")
+
     @property
     def load_type(self) -> str:
         """How to load this plugin: vst3, clap, vst2, or au."""
@@ -83,6 +100,11 @@ PLUGIN_FORMATS = {
     ".clap": "clap",
     ".vst": "vst",
 }
+_PLUGIN_EXT_TUPLE = tuple(PLUGIN_FORMATS)  # For str.endswith()
+
+# Format/arch suffixes stripped from bundle names, in the order they are
+# peeled off the end (so "Foo_x64 VST3" -> "Foo")
+_SUFFIX_RE = re.compile(r"(?:_arm64)?(?:_x64)?(?: CLAP)?(?: AU)?(?: VST3)?\Z")
 
 # Plugin search paths
 USER_PLUGIN_PATHS = [
@@ -100,16 +122,93 @@ SYSTEM_PLUGIN_PATHS = [
 ]
 
 
-def _parse_info_plist(bundle_path: Path) -> tuple[str | None, str | None, str | None]:
+# Info.plist results persisted across runs:
+# {plist_path: [st_mtime_ns, vendor, version, bundle_id]}
+PLIST_CACHE_FILE = "plist_cache.json"
+
+# Threads used to read Info.plist files on cache misses
+PLIST_WORKERS = 16
+
+_plist_cache: dict[str, list] | None = None
+_plist_cache_dirty = False
+
+
+def _get_plist_cache() -> dict[str, list]:
+    """Load the on-disk Info.plist cache (once per process)."""
+    global _plist_cache
+    if _plist_cache is None:
+        try:
+            with open(get_cache_dir() / PLIST_CACHE_FILE) as f:
+                loaded = json.load(f)
+            _plist_cache = loaded if isinstance(loaded, dict) else {}
+        except (OSError, ValueError):
+            _plist_cache = {}
+    return _plist_cache
+
+
+def _save_plist_cache() -> None:
+    """Write the Info.plist cache back to disk if it changed."""
+    global _plist_cache_dirty
+    if not _plist_cache_dirty or _plist_cache is None:
+        return
+
+    cache_path = get_cache_dir() / PLIST_CACHE_FILE
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(_plist_cache, f)
+        os.replace(tmp, cache_path)
+        _plist_cache_dirty = False
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _prune_plist_cache(cache: dict[str, list], bundle_paths: list[Path]) -> None:
+    """Drop cached entries for bundles that are no longer installed."""
+    global _plist_cache_dirty
+    installed = {str(path / "Contents" / "Info.plist") for path in bundle_paths}
+    stale = [key for key in cache if key not in installed]
+    for key in stale:
+        del cache[key]
+    if stale:
+        _plist_cache_dirty = True
+
+
+def _parse_info_plist(
+    bundle_path: Path, cache: dict[str, list]
+) -> tuple[str | None, str | None, str | None]:
     """Extract vendor, version, and bundle ID from plugin's Info.plist.
 
+    Results are cached in cache by plist path and mtime, so unchanged
+    bundles are not re-parsed on later runs. Entries that aren't a
+    [mtime, vendor, version, bundle_id] list (a hand-edited or truncated
+    cache file) are treated as misses.
+
     Returns:
         (vendor, version, bundle_id) tuple
     """
+    global _plist_cache_dirty
+
     plist_path = bundle_path / "Contents" / "Info.plist"
-    if not plist_path.exists():
+    try:
+        mtime = plist_path.stat().st_mtime_ns
+    except OSError:
         return None, None, None
 
+    key = str(plist_path)
+    entry = cache.get(key)
+    if isinstance(entry, list) and len(entry) == 4 and entry[0] == mtime:
+        return entry[1], entry[2], entry[3]
+
+    info = _read_info_plist(plist_path)
+    cache[key] = [mtime, *info]
+    _plist_cache_dirty = True
+    return info
+
+
+def _read_info_plist(plist_path: Path) -> tuple[str | None, str | None, str | None]:
+    """Parse vendor, version, and bundle ID out of an Info.plist file."""
     try:
         with open(plist_path, "rb") as f:
             plist = plistlib.load(f)
@@ -136,29 +235,23 @@ def _extract_plugin_name(path: Path) -> str:
     """Extract clean plugin name from bundle path."""
     name = path.stem
     # Remove common suffixes
-    for suffix in [" VST3", " AU", " CLAP", "_x64", "_arm64"]:
-        if name.endswith(suffix):
-            name = name[: -len(suffix)]
-    return name
+    return _SUFFIX_RE.sub("", name, count=1)
 
 
 def find_plugins_spotlight() -> Iterator[Path]:
     """Find audio plugins using Spotlight."""
-    # Search for each format
-    for ext in PLUGIN_FORMATS:
-        try:
-            result = subprocess.run(
-                ["mdfind", f"kMDItemFSName == '*{ext}'"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                for line in result.stdout.strip().split("\n"):
-                    if line and any(line.endswith(e) for e in PLUGIN_FORMATS):
-                        yield Path(line)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+    # One query for all formats rather than one mdfind process per extension
+    query = " || ".join(f"kMDItemFSName == '*{ext}'" for ext in PLUGIN_FORMATS)
+    try:
+        for line in iter_mdfind([query], timeout=10):
+            if line.endswith(_PLUGIN_EXT_TUPLE):
+                yield Path(line)
+    except subprocess.TimeoutExpired:
+        # Part of the results may already be out; complete them from disk
+        # (get_all_plugins drops the duplicates)
+        yield from find_plugins_filesystem()
+    except FileNotFoundError:
+        return
 
 
 def find_plugins_filesystem() -> Iterator[Path]:
@@ -166,10 +259,14 @@ def find_plugins_filesystem() -> Iterator[Path]:
     all_paths = USER_PLUGIN_PATHS + SYSTEM_PLUGIN_PATHS
 
     for base in all_paths:
-        if base.exists():
-            for item in base.iterdir():
-                if item.suffix in PLUGIN_FORMATS:
-                    yield item
+        try:
+            it = os.scandir(base)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.endswith(_PLUGIN_EXT_TUPLE):
+                    yield Path(entry.path)
 
 
 def _get_location(path: Path) -> str:
@@ -185,12 +282,31 @@ def _get_format(path: Path) -> str:
     return PLUGIN_FORMATS.get(path.suffix, "unknown")
 
 
+# Installed plugins, scanned once per process
+_PLUGIN_CACHE: list[PluginMatch] | None = None
+
+
 def get_all_plugins() -> list[PluginMatch]:
     """Get all plugins from the system.
 
+    The scan (Spotlight plus Info.plist reads) runs once per process, so
+    resolving several devices of a song reuses it. The returned list is
+    shared; don't mutate it.
+
     Returns:
         List of PluginMatch objects (unsorted, unscored)
     """
+    global _PLUGIN_CACHE
+
+    if _PLUGIN_CACHE is None:
+        # Load the Info.plist cache before the scan starts its worker threads,
+        # so they all share one dict
+        _PLUGIN_CACHE = _scan_plugins(_get_plist_cache())
+    return _PLUGIN_CACHE
+
+
+def _scan_plugins(plist_cache: dict[str, list]) -> list[PluginMatch]:
+    """Find installed plugin bundles and read their metadata."""
     seen_paths: set[str] = set()
     plugins: list[PluginMatch] = []
 
@@ -202,6 +318,7 @@ def get_all_plugins() -> list[PluginMatch]:
     except Exception:
         plugin_paths = list(find_plugins_filesystem())
 
+    paths: list[Path] = []
     for path in plugin_paths:
         path_str = str(path)
 
@@ -214,23 +331,27 @@ def get_all_plugins() -> list[PluginMatch]:
         if path.suffix not in PLUGIN_FORMATS:
             continue
 
-        name = _extract_plugin_name(path)
-        vendor, version, bundle_id = _parse_info_plist(path)
-        fmt = _get_format(path)
-        location = _get_location(path)
+        paths.append(path)
+
+    # Info.plist reads are I/O bound, so overlap them across threads
+    with ThreadPoolExecutor(max_workers=PLIST_WORKERS) as executor:
+        infos = list(executor.map(_parse_info_plist, paths, repeat(plist_cache)))
 
+    for path, (vendor, version, bundle_id) in zip(paths, infos):
         plugins.append(
             PluginMatch(
-                name=name,
-                file_path=path_str,
-                format=fmt,
+                name=_extract_plugin_name(path),
+                file_path=str(path),
+                format=_get_format(path),
                 vendor=vendor or "Unknown",
                 version=version,
-                location=location,
+                location=_get_location(path),
                 bundle_id=bundle_id,
             )
         )
 
+    _prune_plist_cache(plist_cache, paths)
+    _save_plist_cache()
     return plugins
 
 
@@ -252,29 +373,45 @@ def search_plugins(
         List of PluginMatch sorted by relevance
     """
     plugins = get_all_plugins()
-    results: list[PluginMatch] = []
+    ranked: list[tuple[float, str, str, int, PluginMatch]] = []
 
-    for plugin in plugins:
+    ctx = QueryCtx.from_query(query)
+    prefilter = min_score > 0
+
+    for i, plugin in enumerate(plugins):
         # Filter by format if specified
         if format_filter and plugin.format != format_filter:
             continue
 
-        # Look up expanded name from abbreviation mapping
-        expanded_name = PLUGIN_ABBREVIATIONS.get(plugin.name.upper(), "")
+        # Expanded name from abbreviation mapping (precomputed)
+        expanded_name = plugin.expanded_name
+
+        # Skip plugins that cannot score above zero without running the scorer
+        if (
+            prefilter
+            and not could_match(ctx, plugin.name_lower, plugin.vendor_lower)
+            and not (
+                expanded_name
+                and could_match(ctx, expanded_name.lower(), plugin.vendor_lower)
+            )
+        ):
+            continue
 
         # Score based on name and vendor
-        score = fuzzy_match(query, plugin.name, plugin.vendor)
+        score = fuzzy_match_lower(ctx, plugin.name_lower, plugin.vendor_lower)
 
         # Also try matching against expanded name if available
         if expanded_name:
-            expanded_score = fuzzy_match(query, expanded_name, plugin.vendor)
+            expanded_score = fuzzy_match_lower(ctx, expanded_name.lower(), plugin.vendor_lower)
             score = max(score, expanded_score)
 
         if score >= min_score:
-            plugin.score = score
-            results.append(plugin)
-
-    # Sort by score (descending), then by name
-    results.sort(key=lambda m: (-m.score, m.name.lower()))
-
-    return results[:limit]
+            ranked.append((-score, plugin.name_lower, plugin.file_path, i, plugin))
+
+    # Top `limit` by score (descending), then by name and path. A bounded heap
+    # avoids sorting every match when only a handful are returned. The cached
+    # plugins are shared across searches, so results are scored copies.
+    return [
+        replace(plugin, score=-neg_score)
+        for neg_score, *_, plugin in heapq.nsmallest(limit, ranked)
+    ]
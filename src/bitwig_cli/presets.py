@@ -2,52 +2,52 @@
 
 from __future__ import annotations
 
+import heapq
+import json
 import os
 import subprocess
-from dataclasses import dataclass
+import sys
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from difflib import get_close_matches
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterator
 
-from .search import fuzzy_match
-
-
-# Device type classifications
-INSTRUMENTS = {
-    "Polymer", "Phase-4", "FM-4", "Polysynth", "Sampler", "Drum Machine",
-    "E-Clap", "E-Cowbell", "E-Hat", "E-Kick", "E-Snare", "E-Tom",
-    "Organ", "FM-4 Operator", "Wavetable",
-    "Poly Grid", "Note Grid",  # Grid-based instruments
-}
-NOTE_FX = {
-    "Note Delay", "Arpeggiator", "Multi-Note", "Note Echo", "Note Filter",
-    "Note Harmonizer", "Note Latch", "Note Length", "Note MOD",
-    "Note Pitch Shifter", "Note Receiver", "Note Velocity", "Transposition Map",
-    "Diatonic Transposer", "Note FX Layer", "Note FX Selector",
-}
-AUDIO_FX = {
-    "Delay+", "Delay-2", "Delay-4", "Reverb", "Convolution",
-    "Compressor", "Dynamics", "Gate", "Peak Limiter", "Transient Control",
-    "EQ+", "EQ-5", "EQ-2", "Ladder", "Resonator Bank",
-    "Chorus", "Flanger", "Phaser", "Freq Shifter", "Pitch Shifter",
-    "Distortion", "Amp", "Bit-8", "Treemonster",
-    "Filter", "Comb", "DC Blocker",
-    "Blur", "Dual Pan", "Stereo Width", "Mid-Side Split", "Multiband FX-2", "Multiband FX-3",
-    "Tool", "Oscilloscope", "Spectrum Analyzer", "Replacer",
-    "FX Grid", "FX Layer", "FX Selector", "Chain",
-    "Rotary", "De-Esser", "Harmonic EQ",
+from .config import get_cache_dir
+from .devices import AUDIO_FX, INSTRUMENTS, NOTE_FX
+from .search import (
+    QueryCtx,
+    fuzzy_match_many,
+    iter_files,
+    iter_files_concurrently,
+    iter_mdfind,
+    word_tokens,
+)
+
+
+# Known device -> type, so classification is one lookup instead of a check per
+# set. Later entries win, keeping the inst > note > fx precedence.
+_DEVICE_TYPES: dict[str, str] = {
+    **dict.fromkeys(AUDIO_FX, "fx"),
+    **dict.fromkeys(NOTE_FX, "note"),
+    **dict.fromkeys(INSTRUMENTS, "inst"),
 }
 
 
+@lru_cache(maxsize=256)
 def _get_device_type(device: str | None) -> str:
-    """Determine if device is instrument, note_fx, or audio_fx."""
+    """Determine if device is instrument, note_fx, or audio_fx.
+
+    Memoized: a library has tens of thousands of presets but only a few
+    dozen distinct device names.
+    """
     if not device:
         return ""
-    if device in INSTRUMENTS:
-        return "inst"
-    if device in NOTE_FX:
-        return "note"
-    if device in AUDIO_FX:
-        return "fx"
+    device_type = _DEVICE_TYPES.get(device)
+    if device_type:
+        return device_type
     # Heuristics for unknown devices
     if "Grid" in device:
         if "FX" in device:
@@ -60,7 +60,7 @@ def _get_device_type(device: str | None) -> str:
     return ""
 
 
-@dataclass
+@dataclass(slots=True)
 class PresetMatch:
     """A preset search result with metadata extracted from path."""
 
@@ -74,6 +74,12 @@ class PresetMatch:
     score: float  # Match relevance score
     load_type: str = "file"  # How to load: always "file" for presets
 
+    # Precomputed sort key
+    name_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.name_lower = self.name.lower()
+
     def to_dict(self) -> dict:
         return {
             "name": self.name,
@@ -100,10 +106,13 @@ def _parse_preset_path(path: str) -> tuple[str, str, str, str | None, str | None
         - category: full path between pack and filename (e.g., "Presets/Polymer")
         - device: extracted device name when identifiable (e.g., "Polymer")
     """
-    p = Path(path)
-    name = p.stem  # Filename without extension
+    # Plain string splitting; building a Path per preset is measurably slower
+    parts = path.split("/")
 
-    parts = p.parts
+    # Filename without extension (dotfiles keep their name, like Path.stem)
+    filename = parts[-1]
+    dot = filename.rfind(".")
+    name = filename[:dot] if dot > 0 else filename
 
     # Try to find installed-packages or "Installed Bitwig Packs" structure
     # Both have: .../marker/5.0/{Package}/{Pack}/.../{Name}.bwpreset
@@ -143,7 +152,7 @@ def _parse_preset_path(path: str) -> tuple[str, str, str, str | None, str | None
         pass
 
     # Fallback: use parent directory as pack
-    return name, "Unknown", p.parent.name, None, None
+    return name, "Unknown", parts[-2] if len(parts) >= 2 else "", None, None
 
 
 def find_presets_spotlight() -> Iterator[str]:
@@ -152,47 +161,359 @@ def find_presets_spotlight() -> Iterator[str]:
     This is fast because it uses macOS Spotlight index.
     """
     try:
-        result = subprocess.run(
-            ["mdfind", "-name", "bwpreset"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                if line.endswith(".bwpreset"):
-                    yield line
+        for line in iter_mdfind(["-name", "bwpreset"], timeout=5):
+            if line.endswith(".bwpreset"):
+                yield line
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        # Fallback to find if mdfind not available
+        # Fallback to find if mdfind not available (or too slow); paths
+        # already streamed are deduplicated by the index build
         yield from find_presets_filesystem()
 
 
+# Preset library roots
+PRESET_SEARCH_PATHS = [
+    Path.home() / "Library/Application Support/Bitwig/Bitwig Studio/installed-packages",
+    Path.home() / "Documents/Bitwig Studio/Library/Presets",
+    Path("/Applications/Bitwig Studio.app/Contents/Resources/Library"),
+    Path("/Volumes/Lacie/bitwig-packages"),
+    Path("/Volumes/Lacie/bitwig-library"),
+]
+
+
 def find_presets_filesystem() -> Iterator[str]:
     """Find presets using filesystem walk (slower fallback)."""
-    search_paths = [
-        Path.home() / "Library/Application Support/Bitwig/Bitwig Studio/installed-packages",
-        Path.home() / "Documents/Bitwig Studio/Library/Presets",
-        Path("/Applications/Bitwig Studio.app/Contents/Resources/Library"),
-        Path("/Volumes/Lacie/bitwig-packages"),
-        Path("/Volumes/Lacie/bitwig-library"),
-    ]
-
-    for base in search_paths:
-        if base.exists():
-            for root, _, files in os.walk(base):
-                for f in files:
-                    if f.endswith(".bwpreset"):
-                        yield os.path.join(root, f)
+    yield from iter_files_concurrently(PRESET_SEARCH_PATHS, ".bwpreset")
 
 
 def find_presets_user_library() -> Iterator[str]:
     """Find presets in user's Bitwig Library (not always indexed by Spotlight)."""
     user_lib = Path.home() / "Documents/Bitwig Studio/Library/Presets"
-    if user_lib.exists():
-        for root, _, files in os.walk(user_lib):
-            for f in files:
-                if f.endswith(".bwpreset"):
-                    yield os.path.join(root, f)
+    yield from iter_files(user_lib, ".bwpreset")
+
+
+# Typo fallback: only words this long are corrected, to names this similar
+TYPO_MIN_LENGTH = 4
+TYPO_CUTOFF = 0.8  # difflib similarity ratio
+
+
+@dataclass
+class _PresetIndex:
+    """Parsed presets plus inverted indexes used to pick scoring candidates.
+
+    Built from one library scan and persisted in the cache dir, so searches
+    skip the scan while the library is unchanged and only score presets
+    that can possibly match. Presets are stored column-wise (one list per
+    field, indexed by preset id); PresetMatch objects are only created for
+    the results a search returns.
+    """
+
+    # Per-preset columns
+    paths: list[str] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    packages: list[str] = field(default_factory=list)
+    packs: list[str] = field(default_factory=list)
+    categories: list[str | None] = field(default_factory=list)
+    devices: list[str | None] = field(default_factory=list)
+    device_types: list[str] = field(default_factory=list)
+
+    # Lowercased search keys, so scoring does no per-query lowercasing
+    names_lower: list[str] = field(default_factory=list)
+    devices_lower: list[str] = field(default_factory=list)
+    packages_lower: list[str] = field(default_factory=list)
+    packs_lower: list[str] = field(default_factory=list)
+
+    # Inverted indexes: key -> preset ids
+    by_token: dict[str, list[int]] = field(default_factory=dict)  # Name word
+    by_device: dict[str, list[int]] = field(default_factory=dict)
+    by_package: dict[str, list[int]] = field(default_factory=dict)
+    by_pack: dict[str, list[int]] = field(default_factory=dict)
+
+    # Every suffix of every name word, sorted, with the word it came from.
+    # A flattened suffix trie: words containing a fragment are the contiguous
+    # run of suffixes that start with it.
+    suffixes: list[str] = field(default_factory=list)
+    suffix_words: list[str] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, paths: list[str], previous: _PresetIndex | None = None) -> _PresetIndex:
+        """Index the given preset paths.
+
+        Args:
+            paths: Scanned preset paths (may contain duplicates)
+            previous: Earlier index whose parsed fields are reused for paths
+                it already covers, so a rebuild only parses new presets
+        """
+        index = cls()
+        known = previous.parsed_fields() if previous is not None else {}
+
+        # dict.fromkeys drops duplicates (Spotlight and the user library
+        # overlap) in one pass while keeping scan order
+        for path in dict.fromkeys(paths):
+            # Skip device-settings (default presets with UUID dirs)
+            if "/device-settings/" in path:
+                continue
+
+            fields = known.get(path)
+            if fields is None:
+                name, package, pack, category, device = _parse_preset_path(path)
+                # Package, pack, category and device repeat across thousands
+                # of presets; interning keeps one copy of each in memory
+                package = sys.intern(package)
+                pack = sys.intern(pack)
+                category = sys.intern(category) if category else category
+                device = sys.intern(device) if device else device
+                device_type = _get_device_type(device)
+            else:
+                name, package, pack, category, device, device_type = fields
+
+            preset_id = len(index.paths)
+            name_lower = name.lower()
+            device_lower = sys.intern(device.lower()) if device else ""
+            package_lower = sys.intern(package.lower())
+            pack_lower = sys.intern(pack.lower())
+
+            index.paths.append(path)
+            index.names.append(name)
+            index.packages.append(package)
+            index.packs.append(pack)
+            index.categories.append(category)
+            index.devices.append(device)
+            index.device_types.append(device_type)
+            index.names_lower.append(name_lower)
+            index.devices_lower.append(device_lower)
+            index.packages_lower.append(package_lower)
+            index.packs_lower.append(pack_lower)
+
+            for token in set(word_tokens(name_lower)):
+                index.by_token.setdefault(token, []).append(preset_id)
+            if device_lower:
+                index.by_device.setdefault(device_lower, []).append(preset_id)
+            index.by_package.setdefault(package_lower, []).append(preset_id)
+            index.by_pack.setdefault(pack_lower, []).append(preset_id)
+
+        pairs = sorted(
+            (token[i:], token) for token in index.by_token for i in range(len(token))
+        )
+        index.suffixes = [suffix for suffix, _ in pairs]
+        index.suffix_words = [token for _, token in pairs]
+        return index
+
+    def parsed_fields(self) -> dict[str, tuple[str, str, str, str | None, str | None, str]]:
+        """path -> (name, package, pack, category, device, device_type)."""
+        columns = zip(
+            self.names, self.packages, self.packs, self.categories, self.devices, self.device_types
+        )
+        return dict(zip(self.paths, columns))
+
+    def _words_containing(self, fragment: str) -> set[str]:
+        """Name words that contain fragment, via a range scan of the suffix list."""
+        words: set[str] = set()
+        suffixes = self.suffixes
+        i = bisect_left(suffixes, fragment)
+        while i < len(suffixes) and suffixes[i].startswith(fragment):
+            words.add(self.suffix_words[i])
+            i += 1
+        return words
+
+    def candidates(self, ctx: QueryCtx) -> set[int] | None:
+        """Ids of presets that can score above zero, or None for "all of them".
+
+        A positive name score needs the query inside the name or a query word
+        inside a name word; either way one of the query's word tokens lies
+        within one of the name's. The device boost and package/pack bonuses
+        are covered by their own indexes.
+        """
+        if not ctx.fragments:
+            return None
+
+        query_lower = ctx.lower
+        ids: set[int] = set()
+        for fragment in ctx.fragments:
+            for token in self._words_containing(fragment):
+                ids.update(self.by_token[token])
+        for device, postings in self.by_device.items():
+            if query_lower in device or device in query_lower:
+                ids.update(postings)
+        ids.update(*self.package_matches(query_lower), *self.pack_matches(query_lower))
+        return ids
+
+    def package_matches(self, query_lower: str) -> list[list[int]]:
+        """Postings of packages containing the query (they get a score bonus)."""
+        return [
+            ids for package, ids in self.by_package.items() if package and query_lower in package
+        ]
+
+    def pack_matches(self, query_lower: str) -> list[list[int]]:
+        """Postings of packs containing the query (they get a score bonus)."""
+        return [ids for pack, ids in self.by_pack.items() if pack and query_lower in pack]
+
+    def score(self, ctx: QueryCtx, min_score: float) -> list[tuple[float, str, str, int]]:
+        """Score presets against the query.
+
+        Returns:
+            (-score, name_lower, path, id) rows for presets scoring at least
+            min_score; paths are unique, so ids never take part in comparisons
+        """
+        query_lower = ctx.lower
+        candidates = self.candidates(ctx) if min_score > 0 else None
+        ids = range(len(self.paths)) if candidates is None else list(candidates)
+        names_lower = self.names_lower
+        paths = self.paths
+
+        # Score based on name and device match (boost by device name), all
+        # candidates in one batch
+        scores = fuzzy_match_many(
+            ctx, map(names_lower.__getitem__, ids), map(self.devices_lower.__getitem__, ids)
+        )
+
+        # Also check package and pack for matches (few ids, usually none)
+        package_ids = set().union(*self.package_matches(query_lower))
+        pack_ids = set().union(*self.pack_matches(query_lower))
+
+        scored: list[tuple[float, str, str, int]] = []
+        for i, score in zip(ids, scores):
+            if i in package_ids:
+                score += 0.30
+            if i in pack_ids:
+                score += 0.20
+
+            if score >= min_score:
+                scored.append((-score, names_lower[i], paths[i], i))
+        return scored
+
+    def correct_query(self, ctx: QueryCtx) -> QueryCtx | None:
+        """Query with unknown words replaced by the closest name words.
+
+        Words of at least TYPO_MIN_LENGTH characters that appear in no name
+        word are matched against the name vocabulary with difflib.
+
+        Returns:
+            The corrected query, or None if no word was corrected
+        """
+        words = list(ctx.words)
+        corrected = False
+        for i, word in enumerate(words):
+            if len(word) < TYPO_MIN_LENGTH or self._words_containing(word):
+                continue
+            close = get_close_matches(word, self.by_token.keys(), n=1, cutoff=TYPO_CUTOFF)
+            if close:
+                words[i] = close[0]
+                corrected = True
+        return QueryCtx.from_query(" ".join(words)) if corrected else None
+
+    def match(self, preset_id: int, score: float) -> PresetMatch:
+        """Materialize one preset as a search result."""
+        return PresetMatch(
+            name=self.names[preset_id],
+            file_path=self.paths[preset_id],
+            package=self.packages[preset_id],
+            pack=self.packs[preset_id],
+            category=self.categories[preset_id],
+            device=self.devices[preset_id],
+            device_type=self.device_types[preset_id],
+            score=score,
+        )
+
+
+# Persistent preset index, JSON: {"version", "created", "signature", "index"}.
+# JSON rather than pickle, so a tampered cache file cannot run code on load.
+PRESET_INDEX_FILE = "presets-index.json"
+PRESET_INDEX_MAX_AGE = 3600.0  # Seconds; bounds staleness the signature misses
+_PRESET_INDEX_VERSION = 6
+
+_preset_index: _PresetIndex | None = None
+_preset_index_signature: list[tuple[str, int]] | None = None
+
+
+def _library_signature() -> list[tuple[str, int]]:
+    """mtimes of the preset roots and their immediate subdirectories.
+
+    Installing a package or adding a device folder touches one of these.
+    Changes deeper in the tree are picked up when the index expires.
+    """
+    signature: list[tuple[str, int]] = []
+    for root in PRESET_SEARCH_PATHS:
+        try:
+            signature.append((str(root), root.stat().st_mtime_ns))
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        signature.append((entry.path, entry.stat().st_mtime_ns))
+        except OSError:
+            continue
+    signature.sort()
+    return signature
+
+
+def _load_preset_index() -> tuple[float, list[tuple[str, int]], _PresetIndex] | None:
+    """Load the on-disk index as (created, signature, index), current or not."""
+    try:
+        with open(get_cache_dir() / PRESET_INDEX_FILE, "rb") as f:
+            stored = json.load(f)
+        if stored["version"] != _PRESET_INDEX_VERSION:
+            return None
+        created = float(stored["created"])
+        signature = [(path, mtime) for path, mtime in stored["signature"]]
+        index = _PresetIndex(**stored["index"])
+    except Exception:
+        return None
+    return created, signature, index
+
+
+def _save_preset_index(signature: list[tuple[str, int]], index: _PresetIndex) -> None:
+    """Write the index to the cache dir (best effort, atomic)."""
+    index_path = get_cache_dir() / PRESET_INDEX_FILE
+    tmp = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    stored = {
+        "version": _PRESET_INDEX_VERSION,
+        "created": time.time(),
+        "signature": signature,
+        "index": vars(index),
+    }
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(stored, f, separators=(",", ":"))
+        os.replace(tmp, index_path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _get_preset_index() -> _PresetIndex:
+    """Return the preset index, scanning the library only when it changed."""
+    global _preset_index, _preset_index_signature
+
+    signature = _library_signature()
+    if _preset_index is not None and _preset_index_signature == signature:
+        return _preset_index
+
+    previous = _preset_index
+    stored = _load_preset_index()
+    if stored is not None:
+        created, stored_signature, previous = stored
+        # An empty signature (no preset root on disk, e.g. a Spotlight-only
+        # library or an unmounted volume) cannot tell libraries apart
+        if (
+            signature
+            and stored_signature == signature
+            and time.time() - created <= PRESET_INDEX_MAX_AGE
+        ):
+            _preset_index, _preset_index_signature = previous, signature
+            return previous
+
+    # Combine Spotlight results with user library (which may not be indexed).
+    # Presets the outdated index already parsed are carried over.
+    paths = [*find_presets_spotlight(), *find_presets_user_library()]
+    index = _PresetIndex.build(paths, previous)
+    _save_preset_index(signature, index)
+
+    _preset_index, _preset_index_signature = index, signature
+    return index
+
+
+def load_preset_index() -> None:
+    """Load the preset index ahead of the first search (scanning if it is stale)."""
+    _get_preset_index()
 
 
 def search_presets(
@@ -210,45 +531,16 @@ def search_presets(
     Returns:
         List of PresetMatch sorted by relevance
     """
-    results: list[PresetMatch] = []
-    seen_paths: set[str] = set()
-
-    # Combine Spotlight results with user library (which may not be indexed)
-    from itertools import chain
-    for path in chain(find_presets_spotlight(), find_presets_user_library()):
-        # Skip duplicates
-        if path in seen_paths:
-            continue
-        seen_paths.add(path)
-        # Skip device-settings (default presets with UUID dirs)
-        if "/device-settings/" in path:
-            continue
-
-        name, package, pack, category, device = _parse_preset_path(path)
-
-        # Score based on name and device match (boost by device name)
-        # Also check package and pack for matches
-        score = fuzzy_match(query, name, device)
-        if package and query.lower() in package.lower():
-            score += 0.30
-        if pack and query.lower() in pack.lower():
-            score += 0.20
-
-        if score >= min_score:
-            results.append(
-                PresetMatch(
-                    name=name,
-                    file_path=path,
-                    package=package,
-                    pack=pack,
-                    category=category,
-                    device=device,
-                    device_type=_get_device_type(device),
-                    score=score,
-                )
-            )
-
-    # Sort by score (descending), then by name
-    results.sort(key=lambda m: (-m.score, m.name.lower()))
-
-    return results[:limit]
+    ctx = QueryCtx.from_query(query)
+    index = _get_preset_index()
+    scored = index.score(ctx, min_score)
+
+    if not scored and min_score > 0:
+        # Nothing matched: retry once with misspelled query words corrected
+        corrected = index.correct_query(ctx)
+        if corrected is not None:
+            scored = index.score(corrected, min_score)
+
+    # Top `limit` by score (descending), then by name and path. A bounded heap
+    # avoids sorting every match when only a handful are returned.
+    return [index.match(i, -neg_score) for neg_score, _, _, i in heapq.nsmallest(limit, scored)]
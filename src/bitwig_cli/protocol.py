@@ -7,12 +7,32 @@ import struct
 from dataclasses import dataclass, field
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # Optional, see the "fast" extra
+    orjson = None
+
 # Frame format: 4-byte big-endian length prefix + UTF-8 JSON payload
 FRAME_HEADER_SIZE = 4
 FRAME_HEADER_FORMAT = ">I"  # Big-endian unsigned 32-bit int
+_FRAME_HEADER = struct.Struct(FRAME_HEADER_FORMAT)  # Format parsed once, not per frame
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
 
+def _loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-@dataclass
+
+@dataclass(slots=True)
 class RPCRequest:
     """JSON-RPC 2.0 request."""
 
@@ -29,10 +49,10 @@ class RPCRequest:
         return d
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict()).decode("utf-8")
 
 
-@dataclass
+@dataclass(slots=True)
 class RPCError:
     """JSON-RPC 2.0 error."""
 
@@ -45,7 +65,7 @@ class RPCError:
         return cls(code=d["code"], message=d["message"], data=d.get("data"))
 
 
-@dataclass
+@dataclass(slots=True)
 class RPCResponse:
     """JSON-RPC 2.0 response."""
 
@@ -61,8 +81,8 @@ class RPCResponse:
         return cls(id=d.get("id"), result=d.get("result"), error=error)
 
     @classmethod
-    def from_json(cls, data: str) -> RPCResponse:
-        return cls.from_dict(json.loads(data))
+    def from_json(cls, data: str | bytes) -> RPCResponse:
+        return cls.from_dict(_loads(data))
 
     def raise_for_error(self) -> None:
         """Raise RPCException if this response is an error."""
@@ -80,35 +100,52 @@ class RPCException(Exception):
 
 def encode_frame(payload: bytes) -> bytes:
     """Encode a payload with a 4-byte length prefix."""
-    return struct.pack(FRAME_HEADER_FORMAT, len(payload)) + payload
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_frame_parts(payload: bytes) -> list[bytes]:
+    """Length prefix and payload as separate buffers, for vectored sends.
+
+    Sending the parts with socket.sendmsg avoids copying the payload into
+    a concatenated frame.
+    """
+    return [_FRAME_HEADER.pack(len(payload)), payload]
 
 
 def decode_frame_header(header: bytes) -> int:
     """Decode the 4-byte length prefix, return payload length."""
-    return struct.unpack(FRAME_HEADER_FORMAT, header)[0]
+    return _FRAME_HEADER.unpack(header)[0]
 
 
 def request_to_frame(request: RPCRequest) -> bytes:
     """Encode an RPC request as a framed message."""
-    payload = request.to_json().encode("utf-8")
-    return encode_frame(payload)
+    return encode_frame(_dumps(request.to_dict()))
+
+
+def request_to_frame_parts(request: RPCRequest) -> list[bytes]:
+    """Encode an RPC request as [length prefix, payload] buffers."""
+    return encode_frame_parts(_dumps(request.to_dict()))
 
 
 def batch_to_frame(requests: list[RPCRequest]) -> bytes:
     """Encode a batch of RPC requests as a framed message."""
-    payload = json.dumps([r.to_dict() for r in requests]).encode("utf-8")
-    return encode_frame(payload)
+    return encode_frame(_dumps([r.to_dict() for r in requests]))
+
+
+def batch_to_frame_parts(requests: list[RPCRequest]) -> list[bytes]:
+    """Encode a batch of RPC requests as [length prefix, payload] buffers."""
+    return encode_frame_parts(_dumps([r.to_dict() for r in requests]))
 
 
 def parse_response(data: bytes) -> RPCResponse | list[RPCResponse]:
     """Parse a response payload (single or batch)."""
-    decoded = json.loads(data.decode("utf-8"))
+    decoded = _loads(data)
     if isinstance(decoded, list):
         return [RPCResponse.from_dict(d) for d in decoded]
     return RPCResponse.from_dict(decoded)
 
 
-@dataclass
+@dataclass(slots=True)
 class RPCNotification:
     """JSON-RPC 2.0 notification (no id, no response expected)."""
 
@@ -126,7 +163,7 @@ def parse_message(data: bytes) -> RPCResponse | RPCNotification:
     Notifications have a 'method' field but no 'id'.
     Responses have an 'id' field (and 'result' or 'error').
     """
-    decoded = json.loads(data.decode("utf-8"))
+    decoded = _loads(data)
 
     # If it has 'method' but no 'id', it's a notification
     if "method" in decoded and "id" not in decoded:
@@ -2,21 +2,28 @@
 
 This module takes user-friendly names like "nektar piano" or "abbey road"
 and resolves them to actual device specifications that Bitwig can load.
+
+Resolvers are memoized per process (a song repeats queries such as
+"Audio Receiver" across tracks), misses included: a run resolves against
+the libraries as they were when it first searched them. Results are frozen,
+so sharing them between callers is safe.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal
 
-from .devices import search_devices
+from .devices import get_all_devices, search_devices
 from .kontakt import search_kontakt
-from .mtron import search_mtron
-from .plugins import search_plugins
-from .presets import search_presets
+from .mtron import get_all_mtron_patches, search_mtron
+from .plugins import get_all_plugins, search_plugins
+from .presets import load_preset_index, search_presets
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceSpec:
     """Resolved device specification for Bitwig insertion."""
 
@@ -28,22 +35,26 @@ class DeviceSpec:
         return {"type": self.type, "path": self.path}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ResolveResult:
     """Result of resolving a device name."""
 
     success: bool
     spec: DeviceSpec | None
     error: str | None = None
-    alternatives: list[str] | None = None  # Suggestions if not found
+    alternatives: tuple[str, ...] | None = None  # Suggestions if not found
 
 
-def resolve_preset(query: str, device_type: str | None = None) -> ResolveResult:
+@lru_cache(maxsize=512)
+def resolve_preset(
+    query: str, device_type: str | None = None, *, with_alternatives: bool = True
+) -> ResolveResult:
     """Resolve a preset name to a file path.
 
     Args:
         query: Fuzzy search query (e.g., "nektar piano", "warm pad")
         device_type: Optional filter: "inst", "note", or "fx"
+        with_alternatives: Fill alternatives with the runner-up names
 
     Returns:
         ResolveResult with the resolved DeviceSpec or error
@@ -69,17 +80,23 @@ def resolve_preset(query: str, device_type: str | None = None) -> ResolveResult:
     )
 
     # Include alternatives for feedback
-    alternatives = [r.name for r in results[1:4]] if len(results) > 1 else None
+    alternatives = (
+        tuple(r.name for r in results[1:4]) if with_alternatives and len(results) > 1 else None
+    )
 
     return ResolveResult(success=True, spec=spec, alternatives=alternatives)
 
 
-def resolve_plugin(query: str, format_filter: str | None = None) -> ResolveResult:
+@lru_cache(maxsize=512)
+def resolve_plugin(
+    query: str, format_filter: str | None = None, *, with_alternatives: bool = True
+) -> ResolveResult:
     """Resolve a plugin name to a path and format.
 
     Args:
         query: Fuzzy search query (e.g., "abbey road", "kontakt")
         format_filter: Optional filter: "vst3", "au", "clap", "vst"
+        with_alternatives: Fill alternatives with the runner-up names
 
     Returns:
         ResolveResult with the resolved DeviceSpec or error
@@ -111,12 +128,17 @@ def resolve_plugin(query: str, format_filter: str | None = None) -> ResolveResul
         display_name=best.name,
     )
 
-    alternatives = [r.name for r in results[1:4]] if len(results) > 1 else None
+    alternatives = (
+        tuple(r.name for r in results[1:4]) if with_alternatives and len(results) > 1 else None
+    )
 
     return ResolveResult(success=True, spec=spec, alternatives=alternatives)
 
 
-def resolve_kontakt(query: str, library_filter: str | None = None) -> ResolveResult:
+@lru_cache(maxsize=512)
+def resolve_kontakt(
+    query: str, library_filter: str | None = None, *, with_alternatives: bool = True
+) -> ResolveResult:
     """Resolve a Kontakt instrument name.
 
     Note: Kontakt instruments are loaded via the Kontakt plugin, so this
@@ -125,6 +147,7 @@ def resolve_kontakt(query: str, library_filter: str | None = None) -> ResolveRes
     Args:
         query: Fuzzy search query
         library_filter: Optional library name filter
+        with_alternatives: Fill alternatives with the runner-up names
 
     Returns:
         ResolveResult with the instrument path
@@ -148,15 +171,20 @@ def resolve_kontakt(query: str, library_filter: str | None = None) -> ResolveRes
         display_name=f"{best.name} ({best.library})",
     )
 
-    alternatives = [r.name for r in results[1:4]] if len(results) > 1 else None
+    alternatives = (
+        tuple(r.name for r in results[1:4]) if with_alternatives and len(results) > 1 else None
+    )
 
     return ResolveResult(success=True, spec=spec, alternatives=alternatives)
 
 
+@lru_cache(maxsize=512)
 def resolve_mtron(
     query: str,
     collection_filter: str | None = None,
     category_filter: str | None = None,
+    *,
+    with_alternatives: bool = True,
 ) -> ResolveResult:
     """Resolve an M-Tron patch name.
 
@@ -166,6 +194,7 @@ def resolve_mtron(
         query: Fuzzy search query
         collection_filter: Optional collection filter
         category_filter: Optional category filter
+        with_alternatives: Fill alternatives with the runner-up names
 
     Returns:
         ResolveResult with the patch path
@@ -189,17 +218,23 @@ def resolve_mtron(
         display_name=f"{best.name} ({best.collection})",
     )
 
-    alternatives = [r.name for r in results[1:4]] if len(results) > 1 else None
+    alternatives = (
+        tuple(r.name for r in results[1:4]) if with_alternatives and len(results) > 1 else None
+    )
 
     return ResolveResult(success=True, spec=spec, alternatives=alternatives)
 
 
-def resolve_base_device(query: str, category_filter: str | None = None) -> ResolveResult:
+@lru_cache(maxsize=512)
+def resolve_base_device(
+    query: str, category_filter: str | None = None, *, with_alternatives: bool = True
+) -> ResolveResult:
     """Resolve a Bitwig base device name (Audio Receiver, Compressor, etc.).
 
     Args:
         query: Fuzzy search query (e.g., "audio receiver", "compressor")
         category_filter: Optional filter: "inst", "note", "fx", "routing", "mod", "util"
+        with_alternatives: Fill alternatives with the runner-up names
 
     Returns:
         ResolveResult with the resolved DeviceSpec or error
@@ -220,7 +255,9 @@ def resolve_base_device(query: str, category_filter: str | None = None) -> Resol
         display_name=best.name,
     )
 
-    alternatives = [r.name for r in results[1:4]] if len(results) > 1 else None
+    alternatives = (
+        tuple(r.name for r in results[1:4]) if with_alternatives and len(results) > 1 else None
+    )
 
     return ResolveResult(success=True, spec=spec, alternatives=alternatives)
 
@@ -238,31 +275,34 @@ def resolve_device(query: str, hint: str | None = None) -> ResolveResult:
     Returns:
         ResolveResult with the resolved device
     """
+    # Callers only report the resolved spec (or the error), so the resolvers
+    # skip building alternatives
+
     # If hint is provided, use the specific resolver
     if hint == "preset":
-        return resolve_preset(query)
+        return resolve_preset(query, with_alternatives=False)
     elif hint == "plugin":
-        return resolve_plugin(query)
+        return resolve_plugin(query, with_alternatives=False)
     elif hint == "kontakt":
-        return resolve_kontakt(query)
+        return resolve_kontakt(query, with_alternatives=False)
     elif hint == "mtron":
-        return resolve_mtron(query)
+        return resolve_mtron(query, with_alternatives=False)
     elif hint == "device":
-        return resolve_base_device(query)
+        return resolve_base_device(query, with_alternatives=False)
 
     # Try to auto-detect based on the query
     # First, try as a preset (most common)
-    result = resolve_preset(query)
+    result = resolve_preset(query, with_alternatives=False)
     if result.success:
         return result
 
     # Then try as a base device (Audio Receiver, Compressor, etc.)
-    result = resolve_base_device(query)
+    result = resolve_base_device(query, with_alternatives=False)
     if result.success:
         return result
 
     # Then try as a plugin
-    result = resolve_plugin(query)
+    result = resolve_plugin(query, with_alternatives=False)
     if result.success:
         return result
 
@@ -274,50 +314,27 @@ def resolve_device(query: str, hint: str | None = None) -> ResolveResult:
     )
 
 
-def resolve_devices(
-    specs: list[dict],
-) -> tuple[list[DeviceSpec], list[str]]:
-    """Resolve a list of device specifications.
-
-    Each spec in the input can be:
-    - {"query": "nektar piano"} - auto-detect
-    - {"query": "reverb", "hint": "preset"} - force preset search
-    - {"query": "kontakt", "hint": "plugin"} - force plugin search
-    - {"type": "file", "path": "/path/to.bwpreset"} - already resolved
+def preload_sources(hints: set[str | None]) -> None:
+    """Load the libraries the given resolver hints will search, concurrently.
 
-    Args:
-        specs: List of device specifications to resolve
-
-    Returns:
-        Tuple of (resolved_specs, errors)
+    Loading is I/O bound (index files, Spotlight, directory walks) and the
+    sources are independent, so they overlap well on threads. Scoring stays
+    serial: it is pure Python and would only contend for the GIL.
     """
-    resolved: list[DeviceSpec] = []
-    errors: list[str] = []
-
-    for spec in specs:
-        # Already resolved?
-        if "type" in spec and "path" in spec:
-            resolved.append(
-                DeviceSpec(
-                    type=spec["type"],
-                    path=spec["path"],
-                    display_name=spec.get("name", spec["path"]),
-                )
-            )
-            continue
-
-        # Need to resolve
-        query = spec.get("query", "")
-        hint = spec.get("hint")
-        count = spec.get("count", 1)
-
-        result = resolve_device(query, hint)
-
-        if result.success and result.spec:
-            # Add the device (possibly multiple times)
-            for _ in range(count):
-                resolved.append(result.spec)
-        else:
-            errors.append(result.error or f"Failed to resolve: {query}")
-
-    return resolved, errors
+    loaders = []
+    if hints & {None, "preset"}:
+        loaders.append(load_preset_index)
+    if hints & {None, "device"}:
+        loaders.append(get_all_devices)
+    # Auto-detection only reaches plugins after presets and base devices both
+    # miss, so only an explicit hint is worth the Spotlight + Info.plist scan
+    if "plugin" in hints:
+        loaders.append(get_all_plugins)
+    if "mtron" in hints:
+        loaders.append(get_all_mtron_patches)
+    if len(loaders) < 2:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        for future in [executor.submit(loader) for loader in loaders]:
+            future.result()
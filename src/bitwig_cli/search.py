@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-import random
+import heapq
+import os
 import re
-from dataclasses import dataclass
-from typing import Callable, Protocol, TypeVar
+import subprocess
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import repeat
+from typing import Protocol, TypeVar
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchMatch:
     """Base class for search results."""
 
@@ -31,6 +38,54 @@ class Searchable(Protocol):
     score: float
 
 
+_WORD_RE = re.compile(r"\w+")
+
+# ASCII characters outside \w, mapped to spaces for word_tokens' fast path
+_ASCII_NON_WORD = str.maketrans(
+    {c: " " for c in map(chr, range(128)) if not (c.isalnum() or c == "_")}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class QueryCtx:
+    """Query-derived state, computed once per search instead of per candidate."""
+
+    lower: str
+    words: tuple[str, ...]  # Whitespace-split query words
+    fragments: tuple[str, ...]  # Word-character runs (see word_tokens)
+
+    @classmethod
+    def from_query(cls, query: str) -> QueryCtx:
+        lower = query.lower()
+        return cls(
+            lower=lower,
+            words=tuple(lower.split()),
+            fragments=tuple(word_tokens(lower)),
+        )
+
+
+def _is_word_char(c: str) -> bool:
+    """Same character class as regex \\w (Unicode alphanumerics and underscore)."""
+    return c.isalnum() or c == "_"
+
+
+def _starts_at_boundary(query_lower: str, name_lower: str, pos: int) -> bool:
+    """True if any occurrence of query_lower, from pos on, starts at a word boundary.
+
+    Equivalent to re.search(rf"\\b{re.escape(query_lower)}", name_lower) given the
+    first occurrence at pos, but with str.find and a character test instead
+    of building and running a regex per query.
+    """
+    n = len(name_lower)
+    while pos != -1:
+        before = pos > 0 and _is_word_char(name_lower[pos - 1])
+        after = pos < n and _is_word_char(name_lower[pos])
+        if before != after:
+            return True
+        pos = name_lower.find(query_lower, pos + 1)
+    return False
+
+
 def fuzzy_match(
     query: str,
     name: str,
@@ -46,7 +101,12 @@ def fuzzy_match(
     - Name substring anywhere: +0.40 + position bonus
     - Name word match: +0.30 + coverage bonus
     - Name partial word: +0.15 + coverage bonus
-    - Random jitter: ±0.03 (to shuffle ties)
+
+    Scoring is deterministic; callers break remaining ties by name and path.
+    The scale is relied on outside ranking (min_score thresholds, the preset
+    package/pack bonuses, and `resolve` taking the top hit), so it is kept as
+    this explicit scheme rather than an edit-distance ratio such as
+    rapidfuzz's WRatio, whose 0-100 scores would reorder results.
 
     Args:
         query: Search query (case insensitive)
@@ -56,10 +116,54 @@ def fuzzy_match(
     Returns:
         Match score (0.0 to ~1.5)
     """
-    query_lower = query.lower()
-    name_lower = name.lower()
-    boost_lower = (boost_field or "").lower()
+    return _score(query.lower(), name.lower(), (boost_field or "").lower())
+
+
+def fuzzy_match_lower(ctx: QueryCtx, name_lower: str, boost_lower: str = "") -> float:
+    """fuzzy_match for callers that hold a QueryCtx and lowercased fields.
+
+    Search loops build the context once and keep lowercased names on their
+    records, so the per-item call skips the three .lower() copies.
+    """
+    return _score(ctx.lower, name_lower, boost_lower)
+
+
+def fuzzy_match_many(
+    ctx: QueryCtx, names_lower: Iterable[str], boosts_lower: Iterable[str]
+) -> list[float]:
+    """fuzzy_match_lower over parallel name/boost sequences.
+
+    The loop is a map() over the memoized scorer, so it runs in C with no
+    Python frame per candidate; only cache misses execute Python code.
+    """
+    return list(map(_score, repeat(ctx.lower), names_lower, boosts_lower))
+
+
+@lru_cache(maxsize=256)
+def _split_query(query_lower: str) -> tuple[str, ...]:
+    """Whitespace-split query words, computed once per distinct query."""
+    return tuple(query_lower.split())
+
+
+@lru_cache(maxsize=100_000)
+def _name_words(name_lower: str) -> tuple[frozenset[str], str]:
+    """Distinct word tokens of a name, and the tokens joined by spaces.
+
+    Query words contain no whitespace, so "qw in joined" is true exactly when
+    qw is a substring of some token: one C-level search instead of a Python
+    loop over the tokens. Computed once per name across queries.
+    """
+    words = word_tokens(name_lower)
+    return frozenset(words), " ".join(words)
 
+
+@lru_cache(maxsize=100_000)
+def _score(query_lower: str, name_lower: str, boost_lower: str) -> float:
+    """Scoring core of fuzzy_match, on lowercased inputs.
+
+    Pure, so results are memoized: libraries repeat names across packs and
+    the same queries recur while resolving a song's devices.
+    """
     score = 0.0
 
     # Boost field matching (high weight)
@@ -77,38 +181,77 @@ def fuzzy_match(
         # Earlier position = slightly higher score
         position_bonus = 0.05 * (1 - pos / max(len(name_lower), 1))
 
-        if re.search(rf"\b{re.escape(query_lower)}", name_lower):
+        if _starts_at_boundary(query_lower, name_lower, pos):
             score += 0.60 + position_bonus
         else:
             score += 0.40 + position_bonus
     else:
         # Word matching
-        query_words = query_lower.split()
-        name_words = list(re.findall(r"\w+", name_lower))
-        name_word_set = set(name_words)
-
-        exact_matches = sum(1 for qw in query_words if qw in name_word_set)
-        if exact_matches > 0:
-            # Coverage bonus: what fraction of query words matched
-            coverage = exact_matches / len(query_words)
-            score += 0.30 * coverage
-
-        # Partial word matching
-        partial_matches = sum(
-            1
-            for qw in query_words
-            if any(qw in nw for nw in name_word_set) and qw not in name_word_set
-        )
-        if partial_matches > 0:
-            coverage = partial_matches / len(query_words)
-            score += 0.15 * coverage
-
-    # Random jitter to randomize ties (±0.03)
-    score += random.uniform(-0.03, 0.03)
+        query_words = _split_query(query_lower)
+        name_word_set, name_joined = _name_words(name_lower)
+
+        if len(query_words) == 1:
+            qw = query_words[0]
+            if qw in name_word_set:
+                score += 0.30
+            elif qw in name_joined:
+                score += 0.15
+        elif query_words:
+            # One pass: the set lookup settles exact words, so only the rest
+            # pay for the substring scan over the name's words
+            exact_matches = 0
+            partial_matches = 0
+            for qw in query_words:
+                if qw in name_word_set:
+                    exact_matches += 1
+                elif qw in name_joined:
+                    partial_matches += 1
+
+            if exact_matches > 0:
+                # Coverage bonus: what fraction of query words matched
+                coverage = exact_matches / len(query_words)
+                score += 0.30 * coverage
+
+            # Partial word matching
+            if partial_matches > 0:
+                coverage = partial_matches / len(query_words)
+                score += 0.15 * coverage
 
     return min(score, 1.5)
 
 
+def word_tokens(text: str) -> list[str]:
+    """Split text into the word tokens fuzzy_match compares query words against.
+
+    Tokens are runs of regex \\w characters. ASCII text (nearly all names)
+    takes a translate/split fast path that gives the same tokens without
+    running the regex engine.
+    """
+    if text.isascii():
+        return text.translate(_ASCII_NON_WORD).split()
+    return _WORD_RE.findall(text)
+
+
+def could_match(ctx: QueryCtx, name_lower: str, boost_lower: str = "") -> bool:
+    """Cheap prefilter: False only if fuzzy_match would score exactly 0.
+
+    Every positive score needs the query in (or around) the boost field,
+    the whole query in the name, or at least one query word inside the
+    name, so plain substring tests reject most candidates before scoring.
+
+    Args:
+        ctx: Query context
+        name_lower: Lowercased item name
+        boost_lower: Lowercased boost field ("" if none)
+    """
+    query_lower = ctx.lower
+    if boost_lower and (query_lower in boost_lower or boost_lower in query_lower):
+        return True
+    if query_lower in name_lower:
+        return True
+    return any(qw in name_lower for qw in ctx.words)
+
+
 def search_and_rank(
     items: list[T],
     query: str,
@@ -128,21 +271,120 @@ def search_and_rank(
         limit: Maximum results to return
 
     Returns:
-        Sorted list of matching items with scores
+        Sorted list of scored copies of the matching items (the items
+        themselves are left unchanged)
     """
-    results = []
+    ctx = QueryCtx.from_query(query)
+    pool = items
+    names_lower = [get_name(item).lower() for item in pool]
+    boosts_lower = (
+        [(get_boost(item) or "").lower() for item in pool] if get_boost else [""] * len(pool)
+    )
+
+    # Only candidates that could_match can score above zero
+    if min_score > 0:
+        keep = [
+            j
+            for j, (name_lower, boost_lower) in enumerate(zip(names_lower, boosts_lower))
+            if could_match(ctx, name_lower, boost_lower)
+        ]
+        pool = [pool[j] for j in keep]
+        names_lower = [names_lower[j] for j in keep]
+        boosts_lower = [boosts_lower[j] for j in keep]
+
+    # Score every candidate in one batched pass over the memoized scorer.
+    # Entries carry the already-lowercased name as the tiebreak, and the
+    # position keeps equal keys in input order.
+    ranked = []
+    scores = fuzzy_match_many(ctx, names_lower, boosts_lower)
+    for j, (item, name_lower, score) in enumerate(zip(pool, names_lower, scores)):
+        if score >= min_score:
+            ranked.append((-score, name_lower, item.file_path, j, item))
 
-    for item in items:
-        name = get_name(item)
-        boost = get_boost(item) if get_boost else None
-        score = fuzzy_match(query, name, boost)
+    # Top `limit` by score (descending), then by name and path, like the
+    # per-source searches. A bounded heap avoids sorting every match when
+    # only a handful are returned.
+    return [
+        replace(item, score=-neg_score) for neg_score, *_, item in heapq.nsmallest(limit, ranked)
+    ]
 
-        if score >= min_score:
-            # Create a copy with the score set
-            item.score = score
-            results.append(item)
 
-    # Sort by score (descending), then by name
-    results.sort(key=lambda m: (-m.score, get_name(m).lower()))
+def iter_mdfind(args: list[str], timeout: float) -> Iterator[str]:
+    """Run mdfind and yield its result paths as they are printed.
+
+    Output is streamed from the pipe instead of buffered whole, so callers
+    start consuming paths while Spotlight is still producing them. The
+    process is killed after timeout seconds (or when the generator is
+    closed early).
 
-    return results[:limit]
+    Raises:
+        FileNotFoundError: mdfind is not available
+        subprocess.TimeoutExpired: mdfind did not finish within timeout
+    """
+    proc = subprocess.Popen(
+        ["mdfind", *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line:
+                yield line
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(proc.args, timeout)
+
+
+def iter_files(root: str | os.PathLike[str], suffix: str) -> Iterator[str]:
+    """Recursively yield paths of files under root ending with suffix.
+
+    Uses os.scandir so file/dir checks come from the cached directory
+    entry rather than a stat per file, and an explicit stack instead of
+    nested generators, so each path is yielded once rather than passed up
+    through every directory level. Like os.walk, symlinked directories are
+    not followed and unreadable directories are skipped.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    yield entry.path
+
+
+def iter_files_concurrently(roots: Iterable[str | os.PathLike[str]], suffix: str) -> Iterator[str]:
+    """iter_files over several roots, walking the roots in parallel threads.
+
+    Directory reads are I/O bound and the roots are usually independent
+    trees (often on different volumes), so the total wall time approaches
+    that of the slowest root. Paths are yielded root by root, in order.
+    """
+    roots = list(roots)
+    if len(roots) <= 1:
+        for root in roots:
+            yield from iter_files(root, suffix)
+        return
+
+    with ThreadPoolExecutor(max_workers=len(roots)) as executor:
+        for paths in executor.map(lambda root: list(iter_files(root, suffix)), roots):
+            yield from paths
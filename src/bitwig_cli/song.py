@@ -0,0 +1,173 @@
+"""Declarative song config: typed view over the YAML used by `project create`.
+
+The YAML is validated and converted once up front, so track creation works
+with attributes instead of re-probing raw dicts for every field.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# libyaml's C loader builds the document without the pure-Python
+# scanner/parser; fall back to the pure-Python one when PyYAML was built
+# without libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# A device entry is either a plain query string or a {"query"/"name", "hint"} dict
+DeviceEntry = str | dict[str, Any]
+
+
+@dataclass
+class ReceiveSpec:
+    """Audio receive from another track (for shared FX tracks)."""
+
+    source: str
+    tap: str = "pre"
+
+    @classmethod
+    def from_value(cls, value: Any) -> ReceiveSpec | None:
+        """Parse "track_name" or {"track_name": "pre/post"}; None if value is neither."""
+        if isinstance(value, str):
+            return cls(source=value)
+        if isinstance(value, dict) and value:
+            source = next(iter(value))
+            return cls(source=str(source), tap=str(value[source]))
+        return None
+
+
+@dataclass
+class TrackConfig:
+    """One entry of the `tracks:` section."""
+
+    name: str
+    type: str = "instrument"
+    instrument: DeviceEntry | None = None
+    note_fx: list[DeviceEntry] = field(default_factory=list)
+    fx: list[DeviceEntry] = field(default_factory=list)
+    devices: list[DeviceEntry] = field(default_factory=list)  # Legacy flat list
+    receives: list[ReceiveSpec] = field(default_factory=list)
+    invalid_receives: list[Any] = field(default_factory=list)  # Skipped with a warning
+    part: str | None = None
+    abc: str | None = None  # Legacy, superseded by part
+    midi: str | None = None  # Legacy, superseded by part
+    # Keys present in the YAML entry: the track's format follows which keys are
+    # given, even with empty values (`fx: []` still marks a declarative track)
+    keys: frozenset[str] = frozenset()
+
+    @property
+    def is_master(self) -> bool:
+        """Master entries add devices to the master bus instead of a new track."""
+        return self.name.lower() == "master"
+
+    @property
+    def is_declarative(self) -> bool:
+        """True if the track uses instrument/note_fx/fx rather than legacy devices."""
+        return not self.keys.isdisjoint(("instrument", "note_fx", "fx"))
+
+    @property
+    def has_instrument(self) -> bool:
+        """True if the entry has an `instrument` key (even an empty one)."""
+        return "instrument" in self.keys
+
+    @property
+    def has_receives(self) -> bool:
+        """True if the entry has a `receives` key (even an empty one)."""
+        return "receives" in self.keys
+
+    @classmethod
+    def from_dict(cls, name: str, d: dict[str, Any] | None) -> TrackConfig:
+        if d is None:
+            d = {}
+        if not isinstance(d, dict):
+            raise ValueError(f"Track '{name}' must be a mapping")
+
+        receives = []
+        invalid_receives = []
+        for value in _as_list(d.get("receives"), name, "receives"):
+            spec = ReceiveSpec.from_value(value)
+            if spec is None:
+                invalid_receives.append(value)
+            else:
+                receives.append(spec)
+
+        return cls(
+            name=name,
+            type=d.get("type", "instrument"),
+            instrument=d.get("instrument"),
+            note_fx=_as_list(d.get("note_fx"), name, "note_fx"),
+            fx=_as_list(d.get("fx"), name, "fx"),
+            devices=_as_list(d.get("devices"), name, "devices"),
+            receives=receives,
+            invalid_receives=invalid_receives,
+            part=d.get("part"),
+            abc=d.get("abc"),
+            midi=d.get("midi"),
+            keys=frozenset(d),
+        )
+
+
+@dataclass
+class SongConfig:
+    """Top-level song config (song metadata, groups, tracks)."""
+
+    title: str
+    tempo: float | None
+    time_signature: str
+    groups: dict[str, Any]
+    tracks: dict[str, TrackConfig]
+
+    @classmethod
+    def from_dict(cls, d: Any) -> SongConfig:
+        """Build from a parsed YAML document.
+
+        Song metadata lives in the `song` section, with legacy top-level
+        fallbacks (name, bpm, tempo, time).
+
+        Raises:
+            ValueError: If the document or any track entry is malformed
+        """
+        if not isinstance(d, dict):
+            raise ValueError("Config must be a YAML mapping")
+
+        song_meta = d.get("song") or {}
+        if not isinstance(song_meta, dict):
+            raise ValueError("'song' section must be a mapping")
+
+        tracks = d.get("tracks") or {}
+        if not isinstance(tracks, dict):
+            raise ValueError("'tracks' section must be a mapping")
+
+        return cls(
+            title=song_meta.get("title") or d.get("name", "Untitled"),
+            tempo=song_meta.get("tempo") or d.get("bpm") or d.get("tempo"),
+            time_signature=song_meta.get("time") or d.get("time") or "4/4",
+            groups=d.get("groups") or {},
+            tracks={
+                str(name): TrackConfig.from_dict(str(name), cfg) for name, cfg in tracks.items()
+            },
+        )
+
+
+def load_song_config(path: Path) -> SongConfig:
+    """Load and validate a song config file.
+
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+        ValueError: If the document is not a valid song config
+    """
+    with open(path, "rb") as f:
+        return SongConfig.from_dict(yaml.load(f, Loader=_YAML_LOADER))
+
+
+def _as_list(value: Any, track: str, key: str) -> list[Any]:
+    """Normalize an optional list field, rejecting scalars of the wrong shape."""
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"Track '{track}': '{key}' must be a list")
+    return value
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterator
 
-from .search import fuzzy_match
+from .search import QueryCtx, could_match, fuzzy_match_lower
 
 # File extensions and their type classification
 SPLICE_EXTENSIONS = {
@@ -173,21 +174,28 @@ def search_splice(
 
     type_filter_lower = type_filter.lower() if type_filter else None
     pack_filter_lower = pack_filter.lower() if pack_filter else None
+    ctx = QueryCtx.from_query(query)
+    prefilter = min_score > 0
 
     for item in content:
         if type_filter_lower and item.type != type_filter_lower:
             continue
 
-        if pack_filter_lower and pack_filter_lower not in item.pack.lower():
+        pack_lower = item.pack.lower()
+        if pack_filter_lower and pack_filter_lower not in pack_lower:
+            continue
+
+        # Skip items that cannot score above zero without running the scorer
+        name_lower = item.name.lower()
+        if prefilter and not could_match(ctx, name_lower, pack_lower):
             continue
 
         # Score based on name and pack
-        score = fuzzy_match(query, item.name, item.pack)
+        score = fuzzy_match_lower(ctx, name_lower, pack_lower)
 
         if score >= min_score:
             item.score = score
             results.append(item)
 
-    results.sort(key=lambda m: (-m.score, m.name.lower()))
-
-    return results[:limit]
+    # Top `limit` by score (descending), then by name and path
+    return heapq.nsmallest(limit, results, key=lambda m: (-m.score, m.name.lower(), m.file_path))
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import Any, Callable
 
 from rich.console import Console
 from rich.table import Table
 
 
-@dataclass
+@dataclass(slots=True)
 class Column:
     """Column definition with optional value extractor."""
 
@@ -19,15 +20,24 @@ class Column:
     max_width: int = 40
     priority: int = 1  # Higher = keep width when shrinking
 
+    # Value extractor resolved from key once, not per cell
+    _extractor: Callable[[Any], Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if callable(self.key):
+            self._extractor = self.key
+        else:
+            # Use column name as attribute if no key given
+            self._extractor = attrgetter(self.name.lower() if self.key is None else self.key)
+
     def get_value(self, row: Any) -> str:
         """Extract string value from row."""
-        if self.key is None:
-            # Use column name as attribute
-            val = getattr(row, self.name.lower(), "")
-        elif callable(self.key):
-            val = self.key(row)
-        else:
-            val = getattr(row, self.key, "")
+        try:
+            val = self._extractor(row)
+        except AttributeError:
+            if callable(self.key):
+                raise
+            val = ""  # Missing attribute
         return str(val) if val else ""
 
 
@@ -52,12 +62,9 @@ def adaptive_table(
             table.add_column(col.name)
         return table
 
-    # Calculate content widths for each column - use actual max width needed
-    col_values: list[list[str]] = []
-
-    for col in columns:
-        values = [col.get_value(row) for row in rows]
-        col_values.append(values)
+    # Cell text, column by column: one map() over the rows per column, with
+    # the extractor bound once. Rich measures the widths from these strings.
+    col_values: list[list[str]] = [list(map(col.get_value, rows)) for col in columns]
 
     # Create table - no truncation, columns size to content
     # width=None removes the terminal width constraint
@@ -65,11 +72,9 @@ def adaptive_table(
     for col in columns:
         table.add_column(col.name, no_wrap=True)
 
-    # Add rows with FULL values - no truncation
-    for row_idx, _row in enumerate(rows):
-        table.add_row(*[
-            col_values[col_idx][row_idx]
-            for col_idx in range(len(columns))
-        ])
+    # Add rows with FULL values - no truncation. zip() transposes the
+    # columns into rows in C instead of indexing every cell.
+    for cells in zip(*col_values):
+        table.add_row(*cells)
 
     return table
@@ -0,0 +1,208 @@
+"""Tests for the M-Tron library parser and search."""
+
+from __future__ import annotations
+
+import random
+import re
+import zlib
+from pathlib import Path
+
+import pytest
+
+from bitwig_cli import mtron
+from bitwig_cli.mtron import _parse_mtron_library
+
+HEADER = b"MD_LIB\x00\x01header"
+PATCH = b"Patch\x00\x07\x01"
+
+
+def _field(key: str, value: str, length: int | None = None) -> bytes:
+    """One field record: key\\x00\\x01{len}\\x05{value}\\x00."""
+    raw = value.encode()
+    size = len(raw) % 256 if length is None else length
+    return key.encode() + b"\x00\x01" + bytes([size]) + b"\x05" + raw + b"\x00"
+
+
+def _patch(**fields: str) -> bytes:
+    return PATCH + b"".join(_field(key, value) for key, value in fields.items())
+
+
+def _library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, data: bytes) -> Path:
+    path = tmp_path / "UPB_md_lib.gforce"
+    path.write_bytes(zlib.compress(data))
+    monkeypatch.setattr(mtron, "MTRON_LIB_PATH", path)
+    return path
+
+
+def _reference_parse(data: bytes) -> list[tuple]:
+    """Straightforward per-patch, per-field search the parser must agree with."""
+    starts = [m.start() for m in re.finditer(re.escape(b"Patch\x00"), data)]
+    patches = []
+    for start, end in zip(starts, starts[1:] + [len(data)]):
+        region = data[start:end]
+
+        def get(key: str) -> str:
+            m = re.search(re.escape(key.encode()) + rb"\x00\x01.\x05([^\x00]*)\x00", region, re.S)
+            return m.group(1).decode("utf-8", errors="replace") if m else ""
+
+        name = get("name")
+        if not name:
+            continue
+        collection = get("collection")
+        patches.append(
+            (
+                name.strip(),
+                get("path").strip(),
+                collection.strip().replace("_", " ") if collection else "Unknown",
+                get("category").strip() or "Unknown",
+                get("author").strip() or None,
+                [v for j in range(10) if (v := get(f"timbres{j}"))],
+                [v for j in range(10) if (v := get(f"types{j}"))],
+            )
+        )
+    return patches
+
+
+def _as_tuples(patches: list[mtron.MTronMatch]) -> list[tuple]:
+    return [
+        (p.name, p.file_path, p.collection, p.category, p.author, p.timbres, p.types)
+        for p in patches
+    ]
+
+
+def test_parse_fields(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _library(
+        tmp_path,
+        monkeypatch,
+        HEADER
+        + _patch(
+            name="Violins 1 ",
+            author="GForce",
+            collection="The_Streetly_Tapes_Vol_2",
+            category="Strings",
+            path="/patches/violins.cpt2",
+            timbres2="Hollow",
+            timbres0="Breathy",
+            types0="Dynamic",
+        ),
+    )
+
+    (patch,) = _parse_mtron_library()
+
+    assert patch.name == "Violins 1"
+    assert patch.author == "GForce"
+    assert patch.collection == "The Streetly Tapes Vol 2"
+    assert patch.category == "Strings"
+    assert patch.file_path == "/patches/violins.cpt2"
+    assert patch.timbres == ["Breathy", "Hollow"]  # In index order, not file order
+    assert patch.types == ["Dynamic"]
+
+
+def test_parse_defaults_and_skips_unnamed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _library(
+        tmp_path,
+        monkeypatch,
+        HEADER + _patch(category="Brass") + _patch(name="Choir"),
+    )
+
+    (patch,) = _parse_mtron_library()
+
+    assert patch.name == "Choir"
+    assert patch.author is None
+    assert patch.collection == "Unknown"
+    assert patch.category == "Unknown"
+    assert patch.file_path == ""
+    assert patch.timbres == []
+
+
+def test_fields_belong_to_their_patch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _library(
+        tmp_path,
+        monkeypatch,
+        HEADER
+        + _patch(name="First", category="Brass")
+        + _field("category", "Ignored")  # Repeat within the region: first value wins
+        + _patch(name="Second")
+        + _patch(name="Third", category="Voices"),
+    )
+
+    assert [(p.name, p.category) for p in _parse_mtron_library()] == [
+        ("First", "Brass"),
+        ("Second", "Unknown"),
+        ("Third", "Voices"),
+    ]
+
+
+def test_length_byte_may_be_newline(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _library(tmp_path, monkeypatch, HEADER + PATCH + _field("name", "0123456789", length=10))
+
+    assert [p.name for p in _parse_mtron_library()] == ["0123456789"]
+
+
+def test_invalid_utf8_is_replaced(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _library(tmp_path, monkeypatch, HEADER + PATCH + b"name\x00\x01\x03\x05Ab\xff\x00")
+
+    assert [p.name for p in _parse_mtron_library()] == ["Ab�"]
+
+
+def test_matches_reference_parser(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Values avoid the "Patch\x00" marker text: a value ending in it (like the
+    # real "Artist Patch" type) starts a spurious patch region for both parsers
+    rng = random.Random(3)
+    words = ["Violins", "Brass", "Choir", "Flute", "Cello", "Tape", "Hollow", "Ünïcode"]
+    records = [HEADER]
+    for i in range(500):
+        fields = {"name": " ".join(rng.sample(words, rng.randint(1, 3))) + f" {i}"}
+        if i % 11 == 0:
+            fields = {}
+        if i % 3:
+            fields["author"] = "GForce"
+        fields["collection"] = rng.choice(["The_Streetly_Tapes_Vol_2", "Mk_II", "Custom"])
+        fields["category"] = rng.choice(["Brass", "Strings", "Voices"])
+        fields["path"] = f"/patches/{i}.cpt2"
+        for j in rng.sample(range(10), rng.randint(0, 4)):
+            fields[f"timbres{j}"] = rng.choice(words)
+        for j in range(rng.randint(0, 3)):
+            fields[f"types{j}"] = rng.choice(["Artist", "Dynamic", "Layered"])
+        keys = list(fields)
+        rng.shuffle(keys)
+        records.append(PATCH + b"".join(_field(key, fields[key]) for key in keys))
+    data = b"".join(records)
+    _library(tmp_path, monkeypatch, data)
+
+    assert _as_tuples(_parse_mtron_library()) == _reference_parse(data)
+
+
+def test_missing_or_corrupt_library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mtron, "MTRON_LIB_PATH", tmp_path / "missing.gforce")
+    assert _parse_mtron_library() == []
+
+    corrupt = tmp_path / "corrupt.gforce"
+    corrupt.write_bytes(b"not zlib data")
+    monkeypatch.setattr(mtron, "MTRON_LIB_PATH", corrupt)
+    assert _parse_mtron_library() == []
+
+    empty = tmp_path / "empty.gforce"
+    empty.write_bytes(b"")
+    monkeypatch.setattr(mtron, "MTRON_LIB_PATH", empty)
+    assert _parse_mtron_library() == []
+
+
+def test_search_results_keep_their_scores(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Searches return scored copies; the cached library is left alone."""
+    _library(
+        tmp_path,
+        monkeypatch,
+        HEADER
+        + _patch(name="Violins", category="Strings")
+        + _patch(name="Brass Section", category="Brass"),
+    )
+    monkeypatch.setattr(mtron, "_MTRON_CACHE", None)
+
+    violins = mtron.search_mtron("violins")
+    mtron.search_mtron("brass")
+
+    assert [(p.name, p.score) for p in violins] == [("Violins", 1.0)]
+    assert [p.score for p in mtron.get_all_mtron_patches()] == [0.0, 0.0]
@@ -0,0 +1,124 @@
+"""Tests for plugin scanning and search."""
+
+from __future__ import annotations
+
+import json
+import plistlib
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from bitwig_cli import plugins
+from bitwig_cli.plugins import PluginMatch, search_plugins
+
+
+def _plugin(name: str, format: str = "vst3") -> PluginMatch:
+    return PluginMatch(
+        name=name,
+        file_path=f"/Library/Audio/Plug-Ins/VST3/{name}.vst3",
+        format=format,
+        vendor="Surge Synth Team",
+        version="1.3",
+        location="system",
+    )
+
+
+@pytest.fixture
+def installed(monkeypatch: pytest.MonkeyPatch) -> list[PluginMatch]:
+    cached = [_plugin("Surge XT"), _plugin("Surge FX"), _plugin("Surge XT Effects", "clap")]
+    monkeypatch.setattr(plugins, "_PLUGIN_CACHE", cached)
+    return cached
+
+
+def test_search_ranks_by_score(installed: list[PluginMatch]) -> None:
+    results = search_plugins("surge xt")
+
+    assert [(p.name, p.score) for p in results] == [
+        ("Surge XT", 1.0),
+        ("Surge XT Effects", 0.65),
+        ("Surge FX", 0.15),
+    ]
+
+
+def test_format_filter(installed: list[PluginMatch]) -> None:
+    assert [p.name for p in search_plugins("surge", format_filter="clap")] == ["Surge XT Effects"]
+
+
+def test_results_keep_their_scores(installed: list[PluginMatch]) -> None:
+    """Searches return scored copies; the shared cached plugins are left alone."""
+    first = search_plugins("surge xt")
+    search_plugins("surge fx")
+
+    assert [(p.name, p.score) for p in first] == [
+        ("Surge XT", 1.0),
+        ("Surge XT Effects", 0.65),
+        ("Surge FX", 0.15),
+    ]
+    assert [p.score for p in installed] == [0.0, 0.0, 0.0]
+
+
+@pytest.fixture
+def bundles(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Installed plugin bundles (mutable), with the plist cache under tmp_path."""
+    paths = []
+    for name in ["Surge XT", "Surge FX"]:
+        bundle = tmp_path / f"{name}.vst3"
+        (bundle / "Contents").mkdir(parents=True)
+        (bundle / "Contents" / "Info.plist").write_bytes(
+            plistlib.dumps({"CFBundleIdentifier": f"org.surge.{name}", "CFBundleVersion": "1.3"})
+        )
+        paths.append(bundle)
+    monkeypatch.setattr(plugins, "get_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(plugins, "_plist_cache", None)
+    monkeypatch.setattr(plugins, "find_plugins_spotlight", lambda: iter(paths))
+    return paths
+
+
+def _rescan(monkeypatch: pytest.MonkeyPatch) -> list[PluginMatch]:
+    """Scan as a new process would: nothing cached in memory."""
+    monkeypatch.setattr(plugins, "_PLUGIN_CACHE", None)
+    monkeypatch.setattr(plugins, "_plist_cache", None)
+    return plugins.get_all_plugins()
+
+
+def _cached_plists() -> dict[str, list]:
+    with open(plugins.get_cache_dir() / plugins.PLIST_CACHE_FILE) as f:
+        return json.load(f)
+
+
+def test_scan_prunes_uninstalled_plists(
+    bundles: list[Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _rescan(monkeypatch)
+    assert sorted(_cached_plists()) == [str(b / "Contents" / "Info.plist") for b in sorted(bundles)]
+
+    uninstalled = bundles.pop()  # Surge FX
+    _rescan(monkeypatch)
+    assert str(uninstalled / "Contents" / "Info.plist") not in _cached_plists()
+
+
+@pytest.mark.parametrize(
+    "make_entry",
+    [
+        lambda mtime: mtime,
+        lambda mtime: [mtime],
+        lambda mtime: [mtime, "Surge", "1.3"],
+        lambda mtime: {"0": mtime},
+        lambda mtime: "corrupt",
+    ],
+    ids=["bare-mtime", "mtime-only", "three-fields", "object", "string"],
+)
+def test_scan_rereads_malformed_plist_entries(
+    bundles: list[Path], monkeypatch: pytest.MonkeyPatch, make_entry: Callable[[int], object]
+) -> None:
+    """A hand-edited or truncated cache entry is re-read instead of aborting the scan."""
+    _rescan(monkeypatch)
+    cache = _cached_plists()
+    key = str(bundles[0] / "Contents" / "Info.plist")
+    cache[key] = make_entry(cache[key][0])
+    (plugins.get_cache_dir() / plugins.PLIST_CACHE_FILE).write_text(json.dumps(cache))
+
+    scanned = {p.name: (p.version, p.bundle_id) for p in _rescan(monkeypatch)}
+
+    assert scanned["Surge XT"] == ("1.3", "org.surge.Surge XT")
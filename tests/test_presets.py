@@ -0,0 +1,202 @@
+"""Tests for preset path parsing and the preset search index."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from bitwig_cli import presets
+from bitwig_cli.presets import _parse_preset_path, _PresetIndex
+from bitwig_cli.search import QueryCtx
+
+PACKAGES = "/Users/me/Library/Application Support/Bitwig/Bitwig Studio/installed-packages/5.0"
+USER_LIBRARY = "/Users/me/Documents/Bitwig Studio/Library/Presets"
+WORDS = [
+    "warm", "pad", "grand", "piano", "sub", "bass", "lead", "soft", "dark", "keys",
+    "string", "brass", "glass", "dream", "pluck", "arp", "tape", "room", "plate", "café",
+]  # fmt: skip
+DEVICES = ["Polymer", "Phase-4", "FM-4", "Sampler", "Delay+", "Reverb", "Arpeggiator"]
+
+
+def _corpus(size: int = 2000, seed: int = 7) -> list[str]:
+    """Deterministic preset paths across packages, packs, devices and layouts."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(size):
+        name = " ".join(rng.sample(WORDS, rng.randint(1, 3))).title()
+        if rng.random() < 0.3:
+            name += f" {i}"
+        if rng.random() < 0.1:
+            name = name.replace(" ", "-")
+        package = rng.choice(["Bitwig", "Bajaao", "Wavetable Works"])
+        pack = rng.choice(["Essentials", "Wundertuete Vol. 1", "Dark Keys"])
+        device = rng.choice(DEVICES)
+        layout = rng.random()
+        if layout < 0.7:
+            paths.append(f"{PACKAGES}/{package}/{pack}/Presets/{device}/{name}.bwpreset")
+        elif layout < 0.85:
+            paths.append(f"{PACKAGES}/{package}/{pack}/{name}.bwpreset")
+        else:
+            paths.append(f"{USER_LIBRARY}/{device}/{name}.bwpreset")
+    return paths
+
+
+@pytest.fixture(scope="module")
+def index() -> _PresetIndex:
+    return _PresetIndex.build(_corpus())
+
+
+def test_parse_package_preset() -> None:
+    path = f"{PACKAGES}/Bitwig/Essentials/Presets/Polymer/Warm Pad.bwpreset"
+
+    assert _parse_preset_path(path) == (
+        "Warm Pad",
+        "Bitwig",
+        "Essentials",
+        "Presets/Polymer",
+        "Polymer",
+    )
+
+
+def test_parse_flat_pack_preset() -> None:
+    path = f"{PACKAGES}/Bajaao/Sitar/Sitar Drone.bwpreset"
+
+    assert _parse_preset_path(path) == ("Sitar Drone", "Bajaao", "Sitar", None, None)
+
+
+def test_parse_user_library_preset() -> None:
+    path = f"{USER_LIBRARY}/Sampler/My Keys.bwpreset"
+
+    assert _parse_preset_path(path) == ("My Keys", "User", "User Library", "Sampler", "Sampler")
+
+
+def test_build_skips_duplicates_and_device_settings() -> None:
+    path = f"{PACKAGES}/Bitwig/Essentials/Presets/Polymer/Warm Pad.bwpreset"
+    settings = f"{PACKAGES}/Bitwig/Essentials/device-settings/abc/Default.bwpreset"
+
+    index = _PresetIndex.build([path, settings, path])
+
+    assert index.paths == [path]
+
+
+def test_build_reuses_previous_fields(index: _PresetIndex) -> None:
+    rebuilt = _PresetIndex.build(index.paths, index)
+
+    assert rebuilt == index
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "warm", "warm pad", "pia", "iano", "grand piano", "sub-bass", "sub bass",
+        "polymer", "poly", "delay+", "fm-4", "reverb", "bitwig", "wundertuete",
+        "dark keys", "keys 12", "cafe", "café", "a", "zz", "string brass glass",
+        "pad warm", "  lead  ", "plu", "(tape)",
+    ],
+)  # fmt: skip
+def test_candidates_keep_every_match(index: _PresetIndex, query: str) -> None:
+    """Pruning by the inverted indexes returns exactly what a full scan does."""
+    ctx = QueryCtx.from_query(query)
+    full = sorted(row for row in index.score(ctx, 0.0) if -row[0] >= 0.1)
+
+    assert sorted(index.score(ctx, 0.1)) == full
+
+
+def test_candidates_none_without_word_tokens(index: _PresetIndex) -> None:
+    assert index.candidates(QueryCtx.from_query("+++")) is None
+
+
+def test_correct_query(index: _PresetIndex) -> None:
+    corrected = index.correct_query(QueryCtx.from_query("grnad pinao"))
+
+    assert corrected is not None
+    assert corrected.lower == "grand piano"
+
+
+def test_correct_query_keeps_known_and_short_words(index: _PresetIndex) -> None:
+    assert index.correct_query(QueryCtx.from_query("warm pad")) is None
+    assert index.correct_query(QueryCtx.from_query("pda")) is None
+
+
+def test_search_retries_misspelled_query(
+    index: _PresetIndex, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(presets, "_get_preset_index", lambda: index)
+
+    results = presets.search_presets("pinao", limit=5)
+
+    assert results
+    assert all("piano" in match.name_lower for match in results)
+
+
+def test_search_ranks_by_score_then_name(
+    index: _PresetIndex, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(presets, "_get_preset_index", lambda: index)
+
+    results = presets.search_presets("warm pad", limit=50)
+    keys = [(-match.score, match.name_lower, match.file_path) for match in results]
+
+    assert results
+    assert keys == sorted(keys)
+
+
+@pytest.fixture
+def library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Scanned preset paths (mutable), with the index cached under tmp_path."""
+    paths = [f"{PACKAGES}/Bitwig/Essentials/Presets/Polymer/Warm Pad.bwpreset"]
+    monkeypatch.setattr(presets, "get_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(presets, "find_presets_spotlight", lambda: iter(paths))
+    monkeypatch.setattr(presets, "find_presets_user_library", lambda: iter(()))
+    monkeypatch.setattr(presets, "_preset_index", None)
+    monkeypatch.setattr(presets, "_preset_index_signature", None)
+    return paths
+
+
+def test_saved_index_round_trip(index: _PresetIndex, library: list[str]) -> None:
+    signature = [("/presets", 1), ("/presets/Bitwig", 2)]
+
+    presets._save_preset_index(signature, index)
+    stored = presets._load_preset_index()
+
+    assert stored is not None
+    _, stored_signature, loaded = stored
+    assert stored_signature == signature
+    assert loaded == index
+
+
+def test_saved_index_rejects_malformed_file(library: list[str]) -> None:
+    path = presets.get_cache_dir() / presets.PRESET_INDEX_FILE
+    path.parent.mkdir(parents=True)
+    path.write_text('{"version": 6, "created": 0, "signature": [], "index": {"bogus": 1}}')
+
+    assert presets._load_preset_index() is None
+
+
+def test_saved_index_reused_while_signature_matches(
+    library: list[str], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "presets"
+    root.mkdir()
+    monkeypatch.setattr(presets, "PRESET_SEARCH_PATHS", [root])
+    assert [m.name for m in presets.search_presets("warm")] == ["Warm Pad"]
+
+    # A new process with an unchanged library loads the saved index
+    library[:] = []
+    monkeypatch.setattr(presets, "_preset_index", None)
+    assert [m.name for m in presets.search_presets("warm")] == ["Warm Pad"]
+
+
+def test_saved_index_not_reused_without_signature(
+    library: list[str], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """With no preset root on disk nothing tells libraries apart, so rescan."""
+    monkeypatch.setattr(presets, "PRESET_SEARCH_PATHS", [tmp_path / "unmounted"])
+    assert [m.name for m in presets.search_presets("warm")] == ["Warm Pad"]
+
+    library[:] = [f"{PACKAGES}/Bitwig/Essentials/Presets/Polymer/Grand Piano.bwpreset"]
+    monkeypatch.setattr(presets, "_preset_index", None)
+    assert [m.name for m in presets.search_presets("piano")] == ["Grand Piano"]
+    assert presets.search_presets("warm") == []
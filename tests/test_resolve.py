@@ -0,0 +1,158 @@
+"""Tests for device resolution and source preloading."""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from bitwig_cli import main, resolve
+from bitwig_cli.presets import PresetMatch
+from bitwig_cli.song import SongConfig
+
+
+@pytest.fixture
+def loaded(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Names of the resolver sources preload_sources loaded (in any order)."""
+    calls: list[str] = []
+    sources = ["load_preset_index", "get_all_devices", "get_all_plugins", "get_all_mtron_patches"]
+    for name in sources:
+        monkeypatch.setattr(resolve, name, lambda name=name: calls.append(name))
+    return calls
+
+
+def test_preload_auto_detect(loaded: list[str]) -> None:
+    resolve.preload_sources({None})
+
+    assert sorted(loaded) == ["get_all_devices", "load_preset_index"]
+
+
+def test_preload_single_source_stays_lazy(loaded: list[str]) -> None:
+    resolve.preload_sources({"device"})
+
+    assert loaded == []
+
+
+def test_track_device_specs() -> None:
+    song = SongConfig.from_dict(
+        {
+            "tracks": {
+                "piano": {
+                    "instrument": "nektar piano",
+                    "note_fx": ["Humanize x 3"],
+                    "fx": [{"query": "Room One", "hint": "preset"}],
+                },
+                "verb": {"receives": ["piano"], "fx": ["Reverb"]},
+                "lead": {"devices": ["Arpeggiator", "Polymer"]},
+            }
+        }
+    )
+
+    assert main._track_device_specs(song.tracks["piano"]) == [
+        "Humanize x 3",
+        "nektar piano",
+        {"query": "Room One", "hint": "preset"},
+    ]
+    assert main._track_device_specs(song.tracks["verb"]) == [
+        {"query": "Audio Receiver", "hint": "device"},
+        "Reverb",
+    ]
+    assert main._track_device_specs(song.tracks["lead"]) == ["Arpeggiator", "Polymer"]
+
+
+@pytest.mark.parametrize(
+    "track, expected",
+    [
+        ({"fx": [], "devices": ["Reverb"]}, []),
+        ({"instrument": None}, [None]),
+        ({"receives": [42], "devices": ["Reverb"]}, []),
+        ({"receives": [], "devices": ["Reverb"]}, ["Reverb"]),
+    ],
+)
+def test_track_device_specs_follow_key_presence(
+    track: dict[str, object], expected: list[object]
+) -> None:
+    song = SongConfig.from_dict({"tracks": {"piano": track}})
+
+    assert main._track_device_specs(song.tracks["piano"]) == expected
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("nektar piano", ("nektar piano", None)),
+        ({"query": "Room One", "hint": "preset"}, ("Room One", "preset")),
+        ({"name": "Kontakt 7", "hint": "plugin"}, ("Kontakt 7", "plugin")),
+        (42, None),
+    ],
+)
+def test_device_query(spec: object, expected: tuple[str, str | None] | None) -> None:
+    assert main._device_query(spec) == expected  # type: ignore[arg-type]
+
+
+def test_project_create_preloads_every_track(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = tmp_path / "song.yaml"
+    config.write_text(
+        "tracks:\n"
+        "  piano:\n"
+        "    instrument: nektar piano\n"
+        "  strings:\n"
+        "    instrument: {query: Violins, hint: mtron}\n"
+        "  verb:\n"
+        "    receives: [piano]\n"
+    )
+    preloaded: list[set[str | None]] = []
+    monkeypatch.setattr(main, "preload_sources", preloaded.append)
+    monkeypatch.setattr(main, "_set_time_signature", lambda *args: True)
+    monkeypatch.setattr(main, "_create_track", lambda *args: False)
+
+    main.track_create(config, None, "localhost", 0, False)
+
+    assert preloaded == [{None, "mtron", "device"}]
+
+
+def test_preload_plugins_only_when_hinted(loaded: list[str]) -> None:
+    """Auto-detection rarely falls through to plugins, so it doesn't scan them."""
+    resolve.preload_sources({None, "preset"})
+    assert "get_all_plugins" not in loaded
+
+    resolve.preload_sources({None, "plugin"})
+    assert "get_all_plugins" in loaded
+
+
+@pytest.fixture
+def uncached_presets() -> Iterator[None]:
+    """resolve_preset with no memoized results from other tests (or for them)."""
+    resolve.resolve_preset.cache_clear()
+    yield
+    resolve.resolve_preset.cache_clear()
+
+
+def test_memoized_results_are_immutable(
+    uncached_presets: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    matches = [
+        PresetMatch(
+            name=f"Room {n}",
+            file_path=f"/presets/room-{n}.bwpreset",
+            package="Bitwig",
+            pack="Essentials",
+            category="Presets/Reverb",
+            device="Reverb",
+            device_type="fx",
+            score=1.0,
+        )
+        for n in ["One", "Two", "Three"]
+    ]
+    monkeypatch.setattr(resolve, "search_presets", lambda query, limit: matches)
+
+    result = resolve.resolve_preset("room")
+
+    assert result.alternatives == ("Room Two", "Room Three")
+    assert resolve.resolve_preset("room") is result
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.spec.path = "/elsewhere"  # type: ignore[misc, union-attr]
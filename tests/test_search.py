@@ -0,0 +1,229 @@
+"""Tests for the shared fuzzy scorer and search_and_rank."""
+
+from __future__ import annotations
+
+import random
+import re
+from operator import attrgetter
+
+import pytest
+
+from bitwig_cli.search import (
+    QueryCtx,
+    SearchMatch,
+    could_match,
+    fuzzy_match,
+    fuzzy_match_many,
+    search_and_rank,
+    word_tokens,
+)
+
+WORDS = [
+    "warm", "pad", "grand", "piano", "sub", "bass", "lead", "soft", "keys", "string",
+    "tape", "room", "nektar", "abbey", "road", "café", "x-1", "delay+", "o'neil", "2",
+]  # fmt: skip
+QUERIES = [
+    "warm", "warm pad", "pad warm", "pia", "iano", "grand piano", "sub-bass", "sub bass",
+    "nek", "nekt", "nektar", "nektar piano", "abbey road", "road", "café", "cafe",
+    "x-1", "x", "delay+", "o'neil", "neil", "2", "keys 2", "zz", "  lead  ", "WARM",
+]  # fmt: skip
+BOOSTS = ["", "polymer", "piano", "nektar", "room one"]
+
+GET_NAME = attrgetter("name")
+
+
+def _reference_score(query: str, name: str, boost: str | None = None) -> float:
+    """The scoring scheme fuzzy_match documents, written out plainly."""
+    query_lower = query.lower()
+    name_lower = name.lower()
+    boost_lower = (boost or "").lower()
+
+    score = 0.0
+    if boost_lower:
+        if query_lower == boost_lower:
+            score += 0.50
+        elif query_lower in boost_lower or boost_lower in query_lower:
+            score += 0.30
+
+    if query_lower == name_lower:
+        score += 1.00
+    elif query_lower in name_lower:
+        pos = name_lower.find(query_lower)
+        position_bonus = 0.05 * (1 - pos / max(len(name_lower), 1))
+        if re.search(rf"\b{re.escape(query_lower)}", name_lower):
+            score += 0.60 + position_bonus
+        else:
+            score += 0.40 + position_bonus
+    else:
+        query_words = query_lower.split()
+        name_words = set(re.findall(r"\w+", name_lower))
+        exact = sum(1 for qw in query_words if qw in name_words)
+        if exact:
+            score += 0.30 * exact / len(query_words)
+        partial = sum(
+            1 for qw in query_words if qw not in name_words and any(qw in nw for nw in name_words)
+        )
+        if partial:
+            score += 0.15 * partial / len(query_words)
+
+    return min(score, 1.5)
+
+
+def _names(count: int = 400, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        name = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+        if rng.random() < 0.3:
+            name = name.title()
+        if rng.random() < 0.2:
+            name = name.replace(" ", rng.choice(["-", "_", "", "  "]))
+        if rng.random() < 0.2:
+            name += f" {i}"
+        names.append(name)
+    return names
+
+
+def _items(names: list[str]) -> list[SearchMatch]:
+    return [
+        SearchMatch(name=name, file_path=f"/lib/{i}", score=0.0) for i, name in enumerate(names)
+    ]
+
+
+def _reference_rank(
+    items: list[SearchMatch], query: str, min_score: float = 0.1, limit: int = 20
+) -> list[tuple[str, str, float]]:
+    scored = [(item, _reference_score(query, item.name)) for item in items]
+    kept = [(item, score) for item, score in scored if score >= min_score]
+    kept.sort(key=lambda entry: (-entry[1], entry[0].name.lower(), entry[0].file_path))
+    return [(item.name, item.file_path, score) for item, score in kept[:limit]]
+
+
+def _rank(items: list[SearchMatch], query: str, **kwargs: float) -> list[tuple[str, str, float]]:
+    results = search_and_rank(items, query, GET_NAME, **kwargs)  # type: ignore[arg-type]
+    return [(item.name, item.file_path, item.score) for item in results]
+
+
+@pytest.mark.parametrize("boost", BOOSTS)
+def test_fuzzy_match_matches_reference(boost: str) -> None:
+    for name in _names():
+        for query in QUERIES:
+            assert fuzzy_match(query, name, boost) == _reference_score(query, name, boost), (
+                query,
+                name,
+            )
+
+
+def test_fuzzy_match_many_matches_fuzzy_match() -> None:
+    names = _names()
+    for query in QUERIES:
+        ctx = QueryCtx.from_query(query)
+        expected = [fuzzy_match(query, name, "piano") for name in names]
+        assert fuzzy_match_many(ctx, [n.lower() for n in names], ["piano"] * len(names)) == (
+            expected
+        )
+
+
+def test_could_match_never_drops_a_scoring_name() -> None:
+    for name in _names():
+        for query in QUERIES:
+            if fuzzy_match(query, name) > 0:
+                assert could_match(QueryCtx.from_query(query), name.lower()), (query, name)
+
+
+@pytest.mark.parametrize("text", ["Grand Piano", "sub-bass_2", "o'neil  x-1", "Café Crème", ""])
+def test_word_tokens_match_regex(text: str) -> None:
+    assert word_tokens(text) == re.findall(r"\w+", text)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_and_rank_matches_reference(query: str) -> None:
+    items = _items(_names())
+
+    assert _rank(items, query) == _reference_rank(items, query)
+
+
+def test_search_and_rank_min_score_zero_and_limit() -> None:
+    items = _items(_names(50))
+
+    assert _rank(items, "warm", min_score=0, limit=100) == _reference_rank(
+        items, "warm", min_score=0, limit=100
+    )
+
+
+def test_incremental_queries_match_reference() -> None:
+    items = _items(_names())
+    for query in ["n", "ne", "nek", "nekt", "nekta", "nektar", "nektar ", "nektar p", "nektar pi"]:
+        assert _rank(items, query) == _reference_rank(items, query), query
+
+
+def test_boost_field() -> None:
+    items = [
+        SearchMatch(name="Soft Keys", file_path="/a", score=0.0),
+        SearchMatch(name="Grand Piano", file_path="/b", score=0.0),
+    ]
+    boosts = {"/a": "Polymer", "/b": None}
+
+    results = search_and_rank(
+        items, "polymer", GET_NAME, lambda item: boosts[item.file_path]
+    )
+
+    assert [item.name for item in results] == ["Soft Keys"]
+    assert results[0].score == 0.5
+
+
+def test_ties_keep_name_then_path_order() -> None:
+    items = [
+        SearchMatch(name="Pad", file_path="/b", score=0.0),
+        SearchMatch(name="pad", file_path="/a", score=0.0),
+        SearchMatch(name="Pad", file_path="/a", score=0.0),
+    ]
+
+    results = search_and_rank(items, "pad", GET_NAME)
+
+    assert [(item.name, item.file_path) for item in results] == [
+        ("pad", "/a"),
+        ("Pad", "/a"),
+        ("Pad", "/b"),
+    ]
+
+
+def test_results_are_scored_copies() -> None:
+    items = _items(["Warm Pad", "Grand Piano"])
+
+    results = search_and_rank(items, "warm", GET_NAME)
+
+    assert [(item.name, item.score) for item in results] == [("Warm Pad", 0.65)]
+    assert results[0] is not items[0]
+    assert [item.score for item in items] == [0.0, 0.0]
+
+
+def test_items_appended_in_place() -> None:
+    items = _items(_names())
+    _rank(items, "zzq")
+
+    items.append(SearchMatch(name="zzqq unique", file_path="/new", score=0.0))
+
+    assert _rank(items, "zzqq") == [("zzqq unique", "/new", 0.6 + 0.05)]
+
+
+def test_items_deleted_in_place() -> None:
+    items = _items(_names())
+    _rank(items, "warm")
+    _rank(items, "piano")
+
+    del items[50:]
+
+    assert _rank(items, "warm") == _reference_rank(items, "warm")
+    assert _rank(items, "warm pad") == _reference_rank(items, "warm pad")
+    assert _rank(items, "piano") == _reference_rank(items, "piano")
+
+
+def test_items_replaced_in_place() -> None:
+    items = _items(_names())
+    _rank(items, "cold")
+
+    items[0] = SearchMatch(name="Cold Lead", file_path="/cold", score=0.0)
+
+    assert _rank(items, "cold") == _reference_rank(items, "cold")
+    assert _rank(items, "cold lead") == _reference_rank(items, "cold lead")
@@ -0,0 +1,153 @@
+"""Tests for the typed song config."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from bitwig_cli.song import ReceiveSpec, SongConfig, TrackConfig, load_song_config
+
+SONGS_DIR = Path(__file__).resolve().parent.parent / "songs"
+
+
+def test_song_metadata_from_song_section() -> None:
+    song = SongConfig.from_dict(
+        {
+            "song": {"title": "Morning Light", "tempo": 88, "time": "3/4"},
+            "groups": {"rhythm": {"tracks": ["piano"]}},
+            "tracks": {"piano": {"instrument": "nektar piano"}},
+        }
+    )
+
+    assert song.title == "Morning Light"
+    assert song.tempo == 88
+    assert song.time_signature == "3/4"
+    assert list(song.groups) == ["rhythm"]
+    assert list(song.tracks) == ["piano"]
+
+
+def test_song_metadata_legacy_fallbacks() -> None:
+    song = SongConfig.from_dict({"name": "Old Song", "bpm": 120, "time": "6/8"})
+
+    assert song.title == "Old Song"
+    assert song.tempo == 120
+    assert song.time_signature == "6/8"
+    assert song.groups == {}
+    assert song.tracks == {}
+
+
+def test_song_metadata_defaults() -> None:
+    song = SongConfig.from_dict({})
+
+    assert song.title == "Untitled"
+    assert song.tempo is None
+    assert song.time_signature == "4/4"
+
+
+def test_declarative_track() -> None:
+    track = TrackConfig.from_dict(
+        "piano",
+        {
+            "instrument": "nektar piano",
+            "note_fx": ["Humanize x 3"],
+            "fx": ["Tape-Machine", {"query": "Room One", "hint": "preset"}],
+            "part": "piano.abc",
+        },
+    )
+
+    assert track.type == "instrument"
+    assert track.is_declarative
+    assert not track.is_master
+    assert track.note_fx == ["Humanize x 3"]
+    assert track.fx == ["Tape-Machine", {"query": "Room One", "hint": "preset"}]
+    assert track.devices == []
+    assert track.part == "piano.abc"
+
+
+def test_legacy_track() -> None:
+    track = TrackConfig.from_dict("lead", {"devices": ["Humanize x 3", "nektar piano"]})
+
+    assert not track.is_declarative
+    assert track.devices == ["Humanize x 3", "nektar piano"]
+
+
+def test_empty_track_entry() -> None:
+    track = TrackConfig.from_dict("empty", None)
+
+    assert track.name == "empty"
+    assert not track.is_declarative
+    assert track.receives == []
+
+
+def test_master_track() -> None:
+    assert TrackConfig.from_dict("Master", {"fx": ["Peak Limiter"]}).is_master
+
+
+def test_receives() -> None:
+    track = TrackConfig.from_dict("reverb", {"receives": ["piano", {"bass": "post"}]})
+
+    assert track.receives == [
+        ReceiveSpec(source="piano", tap="pre"),
+        ReceiveSpec(source="bass", tap="post"),
+    ]
+
+
+def test_invalid_receives_are_kept_for_a_warning() -> None:
+    """A bad receives entry is skipped (and reported) instead of failing the load."""
+    track = TrackConfig.from_dict("reverb", {"receives": ["piano", 42, {}]})
+
+    assert track.receives == [ReceiveSpec(source="piano")]
+    assert track.invalid_receives == [42, {}]
+
+
+def test_format_follows_key_presence() -> None:
+    empty_fx = TrackConfig.from_dict("bus", {"fx": [], "devices": ["Reverb"]})
+    blank_instrument = TrackConfig.from_dict("lead", {"instrument": ""})
+    no_receives = TrackConfig.from_dict("verb", {"receives": []})
+
+    assert empty_fx.is_declarative
+    assert blank_instrument.is_declarative
+    assert blank_instrument.has_instrument
+    assert no_receives.has_receives
+    assert not no_receives.is_declarative
+
+
+@pytest.mark.parametrize(
+    "doc, message",
+    [
+        ([], "Config must be a YAML mapping"),
+        ({"song": "title"}, "'song' section must be a mapping"),
+        ({"tracks": ["piano"]}, "'tracks' section must be a mapping"),
+        ({"tracks": {"piano": "nektar piano"}}, "Track 'piano' must be a mapping"),
+        ({"tracks": {"piano": {"fx": "Room One"}}}, "Track 'piano': 'fx' must be a list"),
+        ({"tracks": {"verb": {"receives": "piano"}}}, "Track 'verb': 'receives' must be a list"),
+    ],
+)
+def test_invalid_config(doc: object, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        SongConfig.from_dict(doc)
+
+
+def test_load_song_config(tmp_path: Path) -> None:
+    path = tmp_path / "song.yaml"
+    path.write_text(
+        "song:\n"
+        "  title: Morning Light\n"
+        "tracks:\n"
+        "  piano:\n"
+        "    instrument: nektar piano\n"
+        "    fx: [Room One]\n"
+    )
+
+    song = load_song_config(path)
+
+    assert song.title == "Morning Light"
+    assert song.tracks["piano"].fx == ["Room One"]
+
+
+@pytest.mark.parametrize("path", sorted(SONGS_DIR.glob("*/song.yaml")), ids=lambda p: p.parent.name)
+def test_bundled_songs_load(path: Path) -> None:
+    song = load_song_config(path)
+
+    assert song.title